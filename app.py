@@ -1,10 +1,15 @@
+from utils.startup_profiler import startup_profiler
+
+# 아래 import 들의 시간을 측정
+startup_profiler.start_imports()
+
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 
 from fastapi.middleware.cors import CORSMiddleware
 
 from config.websocket import websocket_manager
-from routes.video_converter import converter_router
+from routes.video_converter import converter_router, process_video_job, discard_video_job, run_inference_batch
 from routes.beanie_crud import crud_router
 from routes.user import user_router
 from routes.chat import chat_router
@@ -13,14 +18,24 @@ from typing import Dict
 
 from config.motor_connection import mongodb
 from config.redis import redisdb
+from config.pubsub import redis_subscriber
+from config.s3 import s3client
+from config.job_queue import video_job_queue
+from config.micro_batcher import inference_batcher
+from config.inference import inference_engine
+from config.write_behind import chat_write_buffer
+from config.document_cache import video_cache
+from utils.password import password_hasher
+
+startup_profiler.stop_imports()
 
 import asyncio
 import logging
-from dotenv import load_dotenv
+from config.settings import load_settings
 
 logger = logging.getLogger(__name__)
 
-load_dotenv('.env')
+load_settings()
 
 app = FastAPI()
 
@@ -39,17 +54,103 @@ async def read_root() -> Dict[str, str]:
     '''
     return {"response": "Hello World"}
 
+@app.get("/stats/redis", response_class=JSONResponse, status_code=200)
+async def get_redis_stats() -> Dict[str, int]:
+    '''
+    현재 worker의 redis connection pool 사용량
+    '''
+    return redisdb.pool_stats()
+
+@app.get("/stats/startup", response_class=JSONResponse, status_code=200)
+async def get_startup_stats() -> dict:
+    '''
+    현재 worker의 시작 시간 (import / connect 별)
+    '''
+    return startup_profiler.stats()
+
 @app.on_event("startup")
 async def on_app_start():
     logger.info("서버 시작, mongo db 연결 시도")
-    await mongodb.connect()
+    with startup_profiler.measure("mongodb"):
+        await mongodb.connect()
+    logger.info("서버 시작, chat write-behind buffer 시작")
+    with startup_profiler.measure("chat_write_buffer"):
+        await chat_write_buffer.start()
     logger.info("서버 시작, redis db 연결 시도")
-    await redisdb.connect()
+    with startup_profiler.measure("redis"):
+        await redisdb.connect()
+    logger.info("서버 시작, websocket manager 시작")
+    with startup_profiler.measure("websocket_manager"):
+        await websocket_manager.start()
+    logger.info("서버 시작, video cache invalidation 채널 등록")
+    with startup_profiler.measure("video_cache"):
+        video_cache.start()
+    logger.info("서버 시작, redis subscriber 시작")
+    with startup_profiler.measure("redis_subscriber"):
+        await redis_subscriber.start()
+    logger.info("서버 시작, s3 client 생성")
+    with startup_profiler.measure("s3"):
+        await s3client.connect()
+    logger.info("서버 시작, password hasher 시작")
+    with startup_profiler.measure("password_hasher"):
+        await password_hasher.start()
+    logger.info("서버 시작, inference engine 시작 (모델 load)")
+    with startup_profiler.measure("inference_engine"):
+        await inference_engine.connect()
+    logger.info("서버 시작, inference micro batcher 시작")
+    with startup_profiler.measure("inference_batcher"):
+        await inference_batcher.start(run_inference_batch)
+    logger.info("서버 시작, video job queue 시작")
+    with startup_profiler.measure("video_job_queue"):
+        await video_job_queue.start(process_video_job, discard_video_job)
+    startup_profiler.report()
 
 
 
 @app.on_event("shutdown")
 async def on_app_shutdown():
+    try:
+        await video_job_queue.close()
+        logger.info("서버 종료, video job queue 종료")
+    except asyncio.exceptions.CancelledError:
+        logger.error("video job queue 종료 중 에러 발생")
+        raise
+
+    try:
+        await password_hasher.close()
+        logger.info("서버 종료, password hasher 종료")
+    except asyncio.exceptions.CancelledError:
+        logger.error("password hasher 종료 중 에러 발생")
+        raise
+
+    try:
+        await inference_batcher.close()
+        logger.info("서버 종료, inference micro batcher 종료")
+    except asyncio.exceptions.CancelledError:
+        logger.error("inference micro batcher 종료 중 에러 발생")
+        raise
+
+    try:
+        await inference_engine.close()
+        logger.info("서버 종료, inference engine 종료")
+    except asyncio.exceptions.CancelledError:
+        logger.error("inference engine 종료 중 에러 발생")
+        raise
+
+    try:
+        await websocket_manager.close_all_connections()
+        logger.info("서버 종료, websocket 연결 해제")
+    except asyncio.exceptions.CancelledError:
+        logger.error("WebSocket 연결 해제 중 에러 발생")
+        raise
+
+    try:
+        await chat_write_buffer.close()
+        logger.info("서버 종료, chat write-behind buffer flush 및 종료")
+    except asyncio.exceptions.CancelledError:
+        logger.error("chat write-behind buffer 종료 중 에러 발생")
+        raise
+
     try:
         await mongodb.close()
         logger.info("서버 종료, mongo db 연결 해제")
@@ -57,6 +158,13 @@ async def on_app_shutdown():
         logger.error("DB 연결 해제 중 에러 발생")
         raise
     
+    try:
+        await redis_subscriber.close()
+        logger.info("서버 종료, redis subscriber 종료")
+    except asyncio.exceptions.CancelledError:
+        logger.error("redis subscriber 종료 중 에러 발생")
+        raise
+
     try:
         await redisdb.close()
         logger.info("서버 종료, redis db 연결 해제")
@@ -65,10 +173,10 @@ async def on_app_shutdown():
         raise
 
     try:
-        await websocket_manager.close_all_connections()
-        logger.info("서버 종료, websocket 연결 해제")
+        await s3client.close()
+        logger.info("서버 종료, s3 client 해제")
     except asyncio.exceptions.CancelledError:
-        logger.error("WebSocket 연결 해제 중 에러 발생")
+        logger.error("S3 client 해제 중 에러 발생")
         raise
         
 
@@ -0,0 +1,90 @@
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import load_settings
+import os
+
+from config.redis import redisdb
+from config.redis_keys import redis_keys
+from config.pubsub import chat_channel
+from config.job_queue import JOB_EVENT_TYPE
+
+load_settings()
+
+# "<milliseconds>-<sequence>" 또는 "<milliseconds>"
+_STREAM_ID_PATTERN = re.compile(r"^\d+(-\d+)?$")
+
+
+def parse_stream_id(entry_id: str) -> Tuple[int, int]:
+    # "1700000000000-0" -> (1700000000000, 0) 비교용, 형식이 다르면 ValueError
+    if not _STREAM_ID_PATTERN.match(entry_id):
+        raise ValueError(f"invalid stream id: {entry_id!r}")
+    milliseconds, _, sequence = entry_id.partition("-")
+    return int(milliseconds), int(sequence or 0)
+
+
+class ChatStream:
+    '''
+    사용자별 redis stream (chat_stream:{user_id}) 기반 채팅 기록
+    - 메시지는 XADD로 추가 (MAXLEN 근사 trim), 추가 후 사용자 채널로 {"id", "sentence"} publish
+    - 재연결한 client는 마지막으로 받은 id 이후를 XRANGE 한 번으로 가져감
+    '''
+    _CHAT_STREAM_MAXLEN = int(os.getenv("CHAT_STREAM_MAXLEN", 1000))
+    _CHAT_STREAM_BATCH = int(os.getenv("CHAT_STREAM_BATCH", 100))
+
+    @property
+    def batch_size(self) -> int:
+        return self._CHAT_STREAM_BATCH
+
+    def _key(self, user_id: str) -> str:
+        return redis_keys.chat_stream.key(user_id)
+
+    async def append(self, user_id: str, sentence: str) -> str:
+        # 메시지 추가와 TTL 갱신을 한 번에 (대화가 없는 사용자의 stream은 CHAT_STREAM_TTL 후 삭제)
+        key = self._key(user_id)
+        async with redisdb.pipeline() as pipe:
+            pipe.xadd(key, {"sentence": sentence}, maxlen=self._CHAT_STREAM_MAXLEN, approximate=True)
+            pipe.expire(key, redis_keys.chat_stream.ttl)
+            entry_id, _ = await pipe.execute()
+        await redisdb.publish(chat_channel(user_id), json.dumps({"id": entry_id, "sentence": sentence}))
+        return entry_id
+
+    async def read(self,
+                   user_id: str,
+                   last_id: Optional[str] = None,
+                   count: Optional[int] = None) -> List[Dict[str, str]]:
+        '''
+        last_id 이후 메시지를 오래된 순서로 반환, last_id가 없으면 최근 count개
+        last_id 형식이 잘못되었거나 count가 1보다 작으면 ValueError (redis까지 보내지 않음)
+        '''
+        if last_id:
+            parse_stream_id(last_id)
+        if count is not None and count < 1:
+            raise ValueError(f"count must be >= 1, got {count}")
+        count = min(count or self._CHAT_STREAM_BATCH, self._CHAT_STREAM_BATCH)
+        key = self._key(user_id)
+        if last_id:
+            entries = await redisdb.xrange(key, min=f"({last_id}", count=count)
+        else:
+            entries = list(reversed(await redisdb.xrevrange(key, count=count)))
+        return [{"id": entry_id, "sentence": fields["sentence"]} for entry_id, fields in entries]
+
+    @staticmethod
+    def decode(message: str) -> Dict[str, Any]:
+        '''
+        pub/sub으로 받은 메시지를 {"id", "sentence", "job"}로 변환 (stream id가 없는 이전 형식도 허용)
+        job queue가 보낸 job 결과 메시지는 "job"에 그대로 담고 sentence는 None
+        '''
+        try:
+            payload = json.loads(message)
+            if isinstance(payload, dict) and payload.get("type") == JOB_EVENT_TYPE:
+                return {"id": None, "sentence": None, "job": payload}
+            if isinstance(payload, dict) and "sentence" in payload:
+                return {"id": payload.get("id"), "sentence": payload["sentence"], "job": None}
+        except ValueError:
+            pass
+        return {"id": None, "sentence": message, "job": None}
+
+# chat stream 싱글톤 패턴
+chat_stream = ChatStream()
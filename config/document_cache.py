@@ -0,0 +1,146 @@
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Iterable, Optional, Tuple
+
+from config.settings import load_settings
+import os
+
+from config.redis import redisdb
+from config.redis_keys import redis_keys, RedisKeyFamily
+from config.pubsub import redis_subscriber
+from models.video import VideoDataModel
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+load_settings()
+
+
+class DocumentCache:
+    '''
+    단건 조회용 read-through 캐시 : (선택) 프로세스 내부 LRU -> redis (TTL) -> mongo
+    - 문서는 JSON 문자열로 저장하고 조회할 때마다 모델로 변환
+    - 수정 / 삭제 시 invalidate -> redis key 삭제 + 문서별 generation 증가 + 다른 worker의 LRU에도 pub/sub으로 전달
+    - mongo에서 읽은 값은 읽기 전의 generation이 그대로일 때만 저장
+      (읽는 도중 invalidate 되었으면 이전 값을 TTL 동안 남기지 않음)
+    - 프로세스 내부 LRU는 짧은 TTL을 두어 invalidation 메시지를 놓쳐도 오래 남지 않음
+    '''
+    _LOCAL_CACHE_SIZE = int(os.getenv("DOCUMENT_CACHE_LOCAL_SIZE", 1024))
+    _LOCAL_CACHE_TTL = float(os.getenv("DOCUMENT_CACHE_LOCAL_TTL", 5))
+    _INVALIDATE_CHUNK = 1000
+
+    def __init__(self, model, name: str, keys: RedisKeyFamily):
+        self.model = model
+        self.name = name
+        self.keys = keys
+        self.local: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.stale_fills = 0
+
+    @property
+    def _invalidate_channel(self) -> str:
+        return f"{self.name}_cache_invalidate"
+
+    def _key(self, id: str) -> str:
+        return self.keys.key(id)
+
+    def _generation_key(self, id: str) -> str:
+        return self.keys.key(id, "generation")
+
+    def start(self):
+        '''
+        redis subscriber 시작 전에 호출해야 invalidation 채널이 함께 subscribe 됨
+        '''
+        if self._LOCAL_CACHE_SIZE > 0:
+            redis_subscriber.add_channel_handler(self._invalidate_channel, self._on_invalidate)
+
+    def _get_local(self, id: str) -> Optional[str]:
+        entry = self.local.get(id)
+        if entry is None:
+            return None
+        expires_at, raw = entry
+        if expires_at < time.monotonic():
+            self.local.pop(id, None)
+            return None
+        self.local.move_to_end(id)
+        return raw
+
+    def _set_local(self, id: str, raw: str):
+        if self._LOCAL_CACHE_SIZE <= 0:
+            return
+        self.local[id] = (time.monotonic() + self._LOCAL_CACHE_TTL, raw)
+        self.local.move_to_end(id)
+        while len(self.local) > self._LOCAL_CACHE_SIZE:
+            self.local.popitem(last=False)
+
+    async def get_or_load(self, id: str, load: Callable[[], Awaitable[Optional[object]]]) -> Optional[object]:
+        id = str(id)
+        raw = self._get_local(id)
+        if raw is not None:
+            self.local_hits += 1
+            return self.model.parse_raw(raw)
+
+        raw, generation = await redisdb.mget(self._key(id), self._generation_key(id))
+        if raw is not None:
+            self.redis_hits += 1
+            self._set_local(id, raw)
+            return self.model.parse_raw(raw)
+
+        self.misses += 1
+        document = await load()
+        if not document:
+            return document
+
+        raw = document.json()
+        filled = await redisdb.set_if_unchanged(
+            self._key(id), raw, self.keys.ttl, self._generation_key(id), generation
+        )
+        if filled:
+            self._set_local(id, raw)
+        else:
+            self.stale_fills += 1
+        return document
+
+    async def invalidate(self, ids: Iterable[str]):
+        ids = [str(id) for id in ids]
+        if not ids:
+            return
+        for id in ids:
+            self.local.pop(id, None)
+        for i in range(0, len(ids), self._INVALIDATE_CHUNK):
+            chunk = ids[i:i + self._INVALIDATE_CHUNK]
+            async with redisdb.pipeline(transaction=False) as pipe:
+                pipe.delete(*[self._key(id) for id in chunk])
+                for id in chunk:
+                    pipe.incr(self._generation_key(id))
+                    pipe.expire(self._generation_key(id), self.keys.ttl)
+                if self._LOCAL_CACHE_SIZE > 0:
+                    pipe.publish(self._invalidate_channel, json.dumps(chunk))
+        self.invalidations += len(ids)
+
+    def _on_invalidate(self, data: str):
+        for id in json.loads(data):
+            self.local.pop(id, None)
+
+    def stats(self) -> dict:
+        hits = self.local_hits + self.redis_hits
+        total = hits + self.misses
+        return {
+            "ttl": self.keys.ttl,
+            "local_size": len(self.local),
+            "local_max_size": self._LOCAL_CACHE_SIZE,
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "stale_fills": self.stale_fills,
+            "hit_ratio": hits / total if total else 0.0,
+        }
+
+# video 단건 조회 캐시 싱글톤 패턴
+video_cache = DocumentCache(VideoDataModel, "video", redis_keys.video_cache)
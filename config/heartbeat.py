@@ -0,0 +1,99 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class HeartbeatScheduler:
+    '''
+    timer wheel 기반 heartbeat
+    - 연결을 wheel의 slot 중 하나에 배치하고, tick 마다 한 slot만 처리
+      -> 각 연결은 interval 마다 한 번 ping, 한 tick에 처리하는 연결 수는 전체 / slot 수
+    - last_seen이 timeout보다 오래된 연결은 모아서 한 번에 정리
+    '''
+    def __init__(self,
+                 interval: float,
+                 timeout: float,
+                 slots: int,
+                 ping: Callable[[Any], None],
+                 reap: Callable[[List[Any]], Awaitable[None]]):
+        self.interval = interval
+        self.timeout = timeout
+        self.slots: List[Set[Any]] = [set() for _ in range(slots)]
+        self.ping = ping
+        self.reap = reap
+        self.position = 0
+        self.task: Optional[asyncio.Task] = None
+
+        self.pings = 0
+        self.reaped = 0
+
+    @property
+    def tick(self) -> float:
+        return self.interval / len(self.slots)
+
+    def start(self):
+        self.task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+    def register(self, connection: Any):
+        # 현재 위치 바로 뒤 slot에 넣어서 약 interval 후 첫 ping
+        connection.heartbeat_slot = (self.position - 1) % len(self.slots)
+        connection.last_seen = time.monotonic()
+        self.slots[connection.heartbeat_slot].add(connection)
+
+    def unregister(self, connection: Any):
+        slot = getattr(connection, "heartbeat_slot", None)
+        if slot is not None:
+            self.slots[slot].discard(connection)
+            connection.heartbeat_slot = None
+
+    @staticmethod
+    def touch(connection: Any):
+        connection.last_seen = time.monotonic()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.tick)
+            try:
+                await self._process_slot()
+            except Exception as e:
+                logger.error(f"heartbeat 처리 실패: {e}")
+
+    async def _process_slot(self):
+        slot = self.slots[self.position]
+        self.position = (self.position + 1) % len(self.slots)
+        if not slot:
+            return
+
+        now = time.monotonic()
+        dead = []
+        for connection in slot:
+            if now - connection.last_seen > self.timeout:
+                dead.append(connection)
+            else:
+                self.ping(connection)
+                self.pings += 1
+
+        if dead:
+            for connection in dead:
+                self.unregister(connection)
+            self.reaped += len(dead)
+            await self.reap(dead)
+
+    def stats(self) -> dict:
+        return {
+            "interval": self.interval,
+            "timeout": self.timeout,
+            "slots": len(self.slots),
+            "connections": sum(len(slot) for slot in self.slots),
+            "pings": self.pings,
+            "reaped": self.reaped,
+        }
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, List, Optional
+
+from config.settings import load_settings
+import os
+
+if TYPE_CHECKING:
+    # numpy / 모델은 서버 시작 시 import하지 않음 (inference 할 때, worker 프로세스에서 load)
+    import numpy as np
+    from utils.sign_model import StandInSignModel
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+load_settings()
+
+# worker 프로세스마다 한 번만 load 되는 모델
+_worker_model: Optional["StandInSignModel"] = None
+
+
+def _load_worker_model():
+    from utils.sign_model import StandInSignModel
+
+    global _worker_model
+    _worker_model = StandInSignModel()
+
+
+def _warmup_worker() -> str:
+    return _worker_model.version
+
+
+def _predict_in_worker(features: "np.ndarray") -> List[str]:
+    return _worker_model.predict_batch(features)
+
+
+class InferenceEngine:
+    '''
+    inference 실행 엔진
+    - local : core 수 크기의 process pool, 서버 시작 시 worker마다 모델을 미리 load
+    - remote : connection pool을 재사용하는 HTTP inference 서버 호출
+    '''
+    _CPU_COUNT = os.cpu_count() or 1
+    _INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "local")
+    _INFERENCE_WORKERS = min(int(os.getenv("INFERENCE_WORKERS", _CPU_COUNT)), _CPU_COUNT)
+    _INFERENCE_TIMEOUT = float(os.getenv("INFERENCE_TIMEOUT", 30))
+    _INFERENCE_REMOTE_URL = os.getenv("INFERENCE_REMOTE_URL", "http://localhost:8000/inference/")
+    _INFERENCE_REMOTE_POOL_SIZE = int(os.getenv("INFERENCE_REMOTE_POOL_SIZE", 10))
+    # remote 서버에 배포된 모델 version (응답에 model_version이 있으면 그 값으로 갱신)
+    _INFERENCE_REMOTE_MODEL_VERSION = os.getenv("INFERENCE_REMOTE_MODEL_VERSION", "remote")
+
+    def __init__(self):
+        self.executor = None
+        # remote backend 에서만 사용 (requests는 그때 import)
+        self.session: Optional[Any] = None
+        self.model_version: Optional[str] = None
+
+    @property
+    def backend(self) -> str:
+        return self._INFERENCE_BACKEND
+
+    async def connect(self):
+        try:
+            if self._INFERENCE_BACKEND == "remote":
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                self.session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=self._INFERENCE_REMOTE_POOL_SIZE,
+                    pool_maxsize=self._INFERENCE_REMOTE_POOL_SIZE,
+                )
+                self.session.mount("http://", adapter)
+                self.session.mount("https://", adapter)
+                self.executor = ThreadPoolExecutor(
+                    max_workers=self._INFERENCE_REMOTE_POOL_SIZE,
+                    thread_name_prefix="inference-remote",
+                )
+                self.model_version = self._INFERENCE_REMOTE_MODEL_VERSION
+            else:
+                # uvicorn 프로세스의 thread / event loop 상태를 물려받지 않도록 spawn 사용
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self._INFERENCE_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_load_worker_model,
+                )
+                await self._warmup()
+            logger.info(f"inference engine 시작 (backend={self._INFERENCE_BACKEND}, version={self.model_version})")
+        except Exception as e:
+            logger.error(f"inference engine 시작 실패: {e}")
+
+    async def _warmup(self):
+        # worker 수만큼 동시에 요청해서 모든 worker 프로세스를 띄우고 모델을 load
+        loop = asyncio.get_running_loop()
+        versions = await asyncio.gather(*[
+            loop.run_in_executor(self.executor, _warmup_worker)
+            for _ in range(self._INFERENCE_WORKERS)
+        ])
+        self.model_version = versions[0]
+
+    async def close(self):
+        if self.executor:
+            await asyncio.get_running_loop().run_in_executor(None, self.executor.shutdown)
+            self.executor = None
+        if self.session:
+            self.session.close()
+            self.session = None
+        logger.info("inference engine 종료.")
+
+    def _predict_remote(self, features: "np.ndarray") -> List[str]:
+        response = self.session.post(
+            self._INFERENCE_REMOTE_URL,
+            json={"features": features.tolist()},
+            timeout=self._INFERENCE_TIMEOUT,
+        )
+        response.raise_for_status()
+        body = response.json()
+        if body.get("model_version"):
+            self.model_version = body["model_version"]
+        return body["sentences"]
+
+    async def infer_batch(self, features: List["np.ndarray"], timeout: Optional[float] = None) -> List[str]:
+        '''
+        feature batch를 inference (timeout 초과 시 asyncio.TimeoutError)
+        '''
+        import numpy as np
+
+        stacked = np.stack(features)
+        func = self._predict_remote if self._INFERENCE_BACKEND == "remote" else _predict_in_worker
+        loop = asyncio.get_running_loop()
+        return await asyncio.wait_for(
+            loop.run_in_executor(self.executor, func, stacked),
+            timeout or self._INFERENCE_TIMEOUT,
+        )
+
+    def stats(self) -> dict:
+        return {
+            "backend": self._INFERENCE_BACKEND,
+            "workers": self._INFERENCE_WORKERS if self._INFERENCE_BACKEND == "local" else self._INFERENCE_REMOTE_POOL_SIZE,
+            "model_version": self.model_version,
+        }
+
+# inference engine 싱글톤 패턴
+inference_engine = InferenceEngine()
@@ -0,0 +1,154 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+from config.settings import load_settings
+import os
+
+from config.inference import inference_engine
+from config.redis import redisdb
+from config.redis_keys import redis_keys
+from models.video import InferenceCacheModel
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+load_settings()
+
+
+class InferenceCache:
+    '''
+    inference 결과 캐시 (content hash, model version, 전처리 파라미터 기준)
+    model version은 connect 된 inference engine이 실제로 load한 모델 version을 사용
+    -> 모델이 바뀌면 key가 바뀌어 이전 결과를 반환하지 않음
+    redis (TTL + 최대 entry 수 초과 시 오래된 순서로 제거) -> mongo (영구 보관) 순서로 조회
+    '''
+    _CACHE_TTL = redis_keys.inference_cache.ttl
+    _CACHE_MAX_ENTRIES = int(os.getenv("INFERENCE_CACHE_MAX_ENTRIES", 10000))
+
+    def __init__(self):
+        self.hits = 0
+        self.mongo_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # 같은 key에 대한 동시 계산을 하나로 합침
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @property
+    def model_version(self) -> str:
+        if not inference_engine.model_version:
+            raise RuntimeError("inference engine is not connected (model version unknown)")
+        return inference_engine.model_version
+
+    @property
+    def _index_key(self) -> str:
+        # 마지막 접근 시간 기준 sorted set (eviction 용)
+        return redis_keys.inference_cache.key("index")
+
+    def make_key(self, content_hash: str, params: dict, model_version: Optional[str] = None) -> str:
+        params_hash = hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:16]
+        return redis_keys.inference_cache.key(content_hash, model_version or self.model_version, params_hash)
+
+    async def get(self, content_hash: str, params: dict) -> Optional[str]:
+        cache_key = self.make_key(content_hash, params)
+
+        # 조회와 LRU index 갱신을 한 번의 왕복으로 (xx : index에 이미 있는 key만 갱신, miss면 아무것도 추가하지 않음)
+        async with redisdb.pipeline(transaction=False) as pipe:
+            pipe.get(cache_key)
+            pipe.zadd(self._index_key, {cache_key: time.time()}, xx=True)
+            sentence, _ = await pipe.execute()
+        if sentence is not None:
+            self.hits += 1
+            return sentence
+
+        cached = await InferenceCacheModel.find_one(InferenceCacheModel.cache_key == cache_key)
+        if cached:
+            self.hits += 1
+            self.mongo_hits += 1
+            await self._set_redis(cache_key, cached.sentence)
+            return cached.sentence
+
+        self.misses += 1
+        return None
+
+    async def set(self, content_hash: str, params: dict, sentence: str):
+        model_version = self.model_version
+        cache_key = self.make_key(content_hash, params, model_version)
+        await self._set_redis(cache_key, sentence)
+
+        # 조회 후 insert 하면 여러 worker가 동시에 같은 key를 저장할 때 unique index 충돌
+        # -> update_one(upsert=True) 한 번으로 저장
+        await InferenceCacheModel.get_motor_collection().update_one(
+            {"cache_key": cache_key},
+            {"$set": {
+                "content_hash": content_hash,
+                "model_version": model_version,
+                "params": params,
+                "sentence": sentence,
+            }},
+            upsert=True,
+        )
+
+    async def get_or_compute(self,
+                             content_hash: str,
+                             params: dict,
+                             compute: Callable[[], Awaitable[str]]) -> str:
+        sentence = await self.get(content_hash, params)
+        if sentence is not None:
+            return sentence
+
+        cache_key = self.make_key(content_hash, params)
+        inflight = self._inflight.get(cache_key)
+        if inflight:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        try:
+            sentence = await compute()
+            await self.set(content_hash, params, sentence)
+            future.set_result(sentence)
+            return sentence
+        except BaseException as e:
+            future.set_exception(e)
+            # 기다리는 쪽이 없는 경우 "exception was never retrieved" 경고 방지
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(cache_key, None)
+
+    async def _set_redis(self, cache_key: str, sentence: str):
+        # 값 저장 + index 갱신 + index 크기 확인을 한 번의 왕복으로
+        async with redisdb.pipeline() as pipe:
+            pipe.set(cache_key, sentence, ex=self._CACHE_TTL)
+            pipe.zadd(self._index_key, {cache_key: time.time()})
+            # index도 마지막 저장 후 TTL이 지나면 (모든 entry가 만료된 뒤) 삭제
+            pipe.expire(self._index_key, self._CACHE_TTL)
+            pipe.zcard(self._index_key)
+            *_, size = await pipe.execute()
+        await self._evict(size)
+
+    async def _evict(self, size: int):
+        overflow = size - self._CACHE_MAX_ENTRIES
+        if overflow <= 0:
+            return
+        evicted = await redisdb.zpopmin(self._index_key, overflow)
+        if evicted:
+            await redisdb.delete(*[cache_key for cache_key, _ in evicted])
+            self.evictions += len(evicted)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "model_version": inference_engine.model_version,
+            "hits": self.hits,
+            "mongo_hits": self.mongo_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+# inference 캐시 싱글톤 패턴
+inference_cache = InferenceCache()
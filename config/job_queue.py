@@ -0,0 +1,153 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from config.settings import load_settings
+import os
+
+from config.redis import redisdb
+from config.redis_keys import redis_keys, RedisKeyFamily
+from config.pubsub import chat_channel
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+load_settings()
+
+JobHandler = Callable[[str, Dict[str, Any]], Awaitable[Dict[str, Any]]]
+# 처리하지 못하고 버리는 job의 정리 (임시 파일 삭제 등)
+JobDiscardHandler = Callable[[str, Dict[str, Any]], None]
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+SHUTDOWN_ERROR = "server shutdown"
+# 사용자 채널로 보내는 job 결과 메시지의 type (채팅 메시지와 구분)
+JOB_EVENT_TYPE = "job"
+
+
+class JobQueue:
+    '''
+    프로세스 내부 asyncio.Queue + worker task 기반의 job queue
+    job 상태는 redis hash(status_keys)에 저장하여 어느 uvicorn worker에서든 조회 가능
+    job이 끝나면 (done / failed) 결과를 요청한 사용자 채널(chat_{user_id})로 publish
+    종료 시 VIDEO_JOB_DRAIN_TIMEOUT 동안 남은 job을 처리하고, 그래도 남은 job은 failed로 기록
+    '''
+    _JOB_WORKERS = int(os.getenv("VIDEO_JOB_WORKERS", 4))
+    _JOB_QUEUE_SIZE = int(os.getenv("VIDEO_JOB_QUEUE_SIZE", 100))
+    _DRAIN_TIMEOUT = float(os.getenv("VIDEO_JOB_DRAIN_TIMEOUT", 30))
+
+    def __init__(self, name: str, status_keys: RedisKeyFamily):
+        self.name = name
+        self.status_keys = status_keys
+        self.queue: Optional[asyncio.Queue] = None
+        self.workers: List[asyncio.Task] = []
+        self.handler: Optional[JobHandler] = None
+        self.on_discard: Optional[JobDiscardHandler] = None
+        self.closing = False
+
+    def _status_key(self, job_id: str) -> str:
+        return self.status_keys.key(job_id)
+
+    async def start(self, handler: JobHandler, on_discard: Optional[JobDiscardHandler] = None):
+        self.handler = handler
+        self.on_discard = on_discard
+        self.closing = False
+        self.queue = asyncio.Queue(maxsize=self._JOB_QUEUE_SIZE)
+        self.workers = [
+            asyncio.create_task(self._worker(index)) for index in range(self._JOB_WORKERS)
+        ]
+        logger.info(f"{self.name} job queue 시작 (workers={self._JOB_WORKERS})")
+
+    async def close(self):
+        # 새 job은 받지 않고, 이미 받은 job(202 응답 완료)은 timeout 안에서 끝까지 처리
+        self.closing = True
+        if self.queue is not None and self.workers:
+            try:
+                await asyncio.wait_for(self.queue.join(), timeout=self._DRAIN_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning(f"{self.name} job queue drain timeout ({self._DRAIN_TIMEOUT}s), 남은 job은 failed 처리")
+
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+        # 시작하지 못한 job은 queued 상태로 남지 않도록 failed 처리
+        while self.queue is not None and not self.queue.empty():
+            job_id, payload = self.queue.get_nowait()
+            if self.on_discard:
+                try:
+                    self.on_discard(job_id, payload)
+                except Exception as e:
+                    logger.error(f"{self.name} job {job_id} 정리 실패: {e}")
+            await self._finish(job_id, payload, status="failed", error=SHUTDOWN_ERROR)
+            self.queue.task_done()
+        logger.info(f"{self.name} job queue 종료.")
+
+    async def enqueue(self, payload: Dict[str, Any]) -> str:
+        if self.closing:
+            raise JobQueueFull(f"{self.name} job queue is shutting down")
+        if self.queue is None or self.queue.full():
+            raise JobQueueFull(f"{self.name} job queue is full")
+
+        job_id = uuid.uuid4().hex
+        await self.set_status(job_id, status="queued", created_at=time.time())
+        self.queue.put_nowait((job_id, payload))
+        return job_id
+
+    async def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        status = await redisdb.hgetall(self._status_key(job_id))
+        if not status:
+            return None
+        return {field: json.loads(value) for field, value in status.items()}
+
+    async def set_status(self, job_id: str, **fields):
+        # 상태는 hash로 저장하고 바뀐 필드만 HSET (이전 상태 조회 없음)
+        fields.update(job_id=job_id, updated_at=time.time())
+        await redisdb.hset(
+            self._status_key(job_id),
+            {field: json.dumps(value) for field, value in fields.items()},
+            ex=self.status_keys.ttl,
+        )
+
+    async def _finish(self, job_id: str, payload: Dict[str, Any], **fields):
+        # 최종 상태 기록 후 사용자 채널로 publish (websocket으로 전달, publish 실패는 상태 기록에 영향 없음)
+        await self.set_status(job_id, **fields)
+        if not payload.get("user_id"):
+            return
+        try:
+            event = {"type": JOB_EVENT_TYPE, "queue": self.name, "job_id": job_id, **fields}
+            await redisdb.publish(chat_channel(payload["user_id"]), json.dumps(event))
+        except Exception as e:
+            logger.error(f"{self.name} job {job_id} 상태 publish 실패: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": len(self.workers),
+            "queue_size": self.queue.qsize() if self.queue else 0,
+            "queue_max_size": self._JOB_QUEUE_SIZE,
+        }
+
+    async def _worker(self, index: int):
+        while True:
+            job_id, payload = await self.queue.get()
+            try:
+                await self.set_status(job_id, status="running")
+                result = await self.handler(job_id, payload)
+                await self._finish(job_id, payload, status="done", result=result)
+            except asyncio.CancelledError:
+                await self._finish(job_id, payload, status="failed", error=SHUTDOWN_ERROR)
+                raise
+            except Exception as e:
+                logger.error(f"{self.name} job {job_id} 처리 실패 (worker {index}): {e}")
+                await self._finish(job_id, payload, status="failed", error=str(e))
+            finally:
+                self.queue.task_done()
+
+# video 처리 job queue 싱글톤 패턴
+video_job_queue = JobQueue("video_job", redis_keys.video_job)
@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+from config.settings import load_settings
+import os
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+load_settings()
+
+BatchHandler = Callable[[List[Any]], Awaitable[List[Any]]]
+
+
+class MicroBatcherFull(Exception):
+    pass
+
+
+class MicroBatcher:
+    '''
+    동시에 들어온 요청을 최대 batch 크기 또는 최대 대기 시간까지 모아서 한 번에 처리하는 batcher
+    결과는 요청 순서대로 각 요청의 future로 전달
+    '''
+    _MAX_BATCH_SIZE = int(os.getenv("INFERENCE_MAX_BATCH_SIZE", 16))
+    _MAX_WAIT_MS = float(os.getenv("INFERENCE_MAX_WAIT_MS", 20))
+    _MAX_QUEUE_SIZE = int(os.getenv("INFERENCE_MAX_QUEUE_SIZE", 256))
+    # 동시에 실행할 수 있는 batch 수
+    _MAX_CONCURRENT_BATCHES = int(os.getenv("INFERENCE_MAX_CONCURRENT_BATCHES", 1))
+
+    def __init__(self, name: str):
+        self.name = name
+        self.queue: Optional[asyncio.Queue] = None
+        self.handler: Optional[BatchHandler] = None
+        self.runners: List[asyncio.Task] = []
+
+        self.batches = 0
+        self.items = 0
+        self.errors = 0
+        self.last_batch_size = 0
+        self.max_queue_depth = 0
+        self.total_wait_seconds = 0.0
+        self.total_batch_seconds = 0.0
+
+    async def start(self, handler: BatchHandler):
+        self.handler = handler
+        self.queue = asyncio.Queue(maxsize=self._MAX_QUEUE_SIZE)
+        self.runners = [
+            asyncio.create_task(self._run()) for _ in range(self._MAX_CONCURRENT_BATCHES)
+        ]
+        logger.info(
+            f"{self.name} micro batcher 시작 "
+            f"(max_batch_size={self._MAX_BATCH_SIZE}, max_wait_ms={self._MAX_WAIT_MS})"
+        )
+
+    async def close(self):
+        for runner in self.runners:
+            runner.cancel()
+        await asyncio.gather(*self.runners, return_exceptions=True)
+        self.runners = []
+
+        # 처리되지 못한 요청은 에러로 종료
+        while self.queue is not None and not self.queue.empty():
+            _, future, _ = self.queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError(f"{self.name} micro batcher closed"))
+        logger.info(f"{self.name} micro batcher 종료.")
+
+    async def submit(self, item: Any) -> Any:
+        if self.queue is None or self.queue.full():
+            raise MicroBatcherFull(f"{self.name} micro batcher queue is full")
+
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((item, future, time.monotonic()))
+        self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+        return await future
+
+    async def _collect(self) -> List[Tuple[Any, asyncio.Future, float]]:
+        batch = [await self.queue.get()]
+        deadline = time.monotonic() + self._MAX_WAIT_MS / 1000
+
+        while len(batch) < self._MAX_BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            # 대기 중에 취소된 요청은 제외
+            batch = [entry for entry in batch if not entry[1].done()]
+            if not batch:
+                continue
+
+            started_at = time.monotonic()
+            self.total_wait_seconds += sum(started_at - enqueued_at for _, _, enqueued_at in batch)
+            try:
+                results = await self.handler([item for item, _, _ in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"batch handler returned {len(results)} results for {len(batch)} items")
+                for (_, future, _), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"{self.name} batch 처리 실패: {e}")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                self.batches += 1
+                self.items += len(batch)
+                self.last_batch_size = len(batch)
+                self.total_batch_seconds += time.monotonic() - started_at
+
+    def stats(self) -> dict:
+        return {
+            "max_batch_size": self._MAX_BATCH_SIZE,
+            "max_wait_ms": self._MAX_WAIT_MS,
+            "max_queue_size": self._MAX_QUEUE_SIZE,
+            "queue_depth": self.queue.qsize() if self.queue else 0,
+            "max_queue_depth": self.max_queue_depth,
+            "batches": self.batches,
+            "items": self.items,
+            "errors": self.errors,
+            "last_batch_size": self.last_batch_size,
+            "avg_batch_size": self.items / self.batches if self.batches else 0.0,
+            "avg_wait_ms": self.total_wait_seconds * 1000 / self.items if self.items else 0.0,
+            "avg_batch_ms": self.total_batch_seconds * 1000 / self.batches if self.batches else 0.0,
+        }
+
+# inference micro batcher 싱글톤 패턴
+inference_batcher = MicroBatcher("inference")
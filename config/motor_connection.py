@@ -3,18 +3,19 @@ from motor.motor_asyncio import AsyncIOMotorClient
 from typing import Optional, List, Any 
 from beanie import init_beanie
 
-from models.video import VideoDataModel, UserChatModel
+from models.video import VideoDataModel, UserChatModel, InferenceCacheModel
 from models.user import User
 
+from pymongo.errors import DuplicateKeyError
 from urllib.parse import quote_plus
 import logging
-from dotenv import load_dotenv
+from config.settings import load_settings
 import os
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-load_dotenv('.env')
+load_settings()
 
 class MongoDB:
     _DATABASE_URI = os.getenv("DATABASE_URI")
@@ -36,13 +37,23 @@ class MongoDB:
         try:
             self.client = AsyncIOMotorClient(self._MONGO_URL)
             database = self.client[self._DATABASE_NAME]
+            # 모델의 Settings.indexes / Indexed 필드에 선언된 index를 여기서 생성
             await init_beanie(
                 database=database,
-                document_models=[VideoDataModel, UserChatModel, User ],
+                document_models=[VideoDataModel, UserChatModel, InferenceCacheModel, User ],
                 )
             logger.info("데이터베이스에 성공적으로 연결이 되었습니다.")
+        except DuplicateKeyError as e:
+            # 기존 데이터에 중복 값이 있으면 unique index를 만들 수 없음 -> 중복 정리 후 다시 시작
+            logger.error(
+                f"unique index 생성 실패, 중복 데이터 정리 필요 "
+                f"(예: db.user.aggregate([{{$group: {{_id: '$username', n: {{$sum: 1}}}}}}, {{$match: {{n: {{$gt: 1}}}}}}])): {e}"
+            )
+            raise
         except Exception as e:
+            # beanie 초기화 없이 서버가 뜨면 모든 요청이 실패하므로 시작을 중단
             logger.error(f"데이터베이스 연결에 실패: {e}")
+            raise
 
     async def close(self):
         if self.client:
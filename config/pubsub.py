@@ -0,0 +1,116 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Callable, Dict, Set
+
+from config.settings import load_settings
+import os
+
+from config.redis import redisdb
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+load_settings()
+
+# 사용자 채팅 채널 이름 규칙 : chat_{user_id}
+CHAT_CHANNEL_PREFIX = "chat_"
+
+
+def chat_channel(user_id: str) -> str:
+    return f"{CHAT_CHANNEL_PREFIX}{user_id}"
+
+
+class RedisSubscriber:
+    '''
+    프로세스 당 하나의 redis pub/sub 연결로 모든 사용자 채널(chat_*)을 pattern subscribe 하고,
+    받은 메시지를 프로세스 내부의 사용자별 queue로 전달
+    그 외 채널은 add_channel_handler로 등록한 handler를 호출 (start 전에 등록)
+    '''
+    _QUEUE_SIZE = int(os.getenv("CHAT_QUEUE_SIZE", 100))
+    _RECONNECT_DELAY = float(os.getenv("CHAT_SUBSCRIBER_RECONNECT_DELAY", 1))
+
+    def __init__(self):
+        self.task = None
+        self.queues: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self.channel_handlers: Dict[str, Callable[[str], None]] = {}
+        self.delivered = 0
+        self.dropped = 0
+
+    async def start(self):
+        self.task = asyncio.create_task(self._run())
+        logger.info("redis subscriber 시작")
+
+    async def close(self):
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+            logger.info("redis subscriber 종료.")
+
+    def add_channel_handler(self, channel: str, handler: Callable[[str], None]):
+        # handler는 subscriber loop에서 바로 호출되므로 blocking 작업을 하면 안 됨
+        self.channel_handlers[channel] = handler
+
+    def _call_handler(self, channel: str, data: str):
+        # handler 에러(잘못된 payload 등)로 공유 구독 연결 전체가 재연결되지 않도록 여기서 처리
+        handler = self.channel_handlers.get(channel)
+        if handler is None:
+            return
+        try:
+            handler(data)
+        except Exception as e:
+            logger.error(f"redis subscriber handler 에러 ({channel}): {e}")
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self._QUEUE_SIZE)
+        self.queues[user_id].add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue):
+        queues = self.queues.get(user_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            self.queues.pop(user_id, None)
+
+    def dispatch(self, user_id: str, message: str):
+        for queue in self.queues.get(user_id, ()):
+            if queue.full():
+                # 읽지 못하는 client는 가장 오래된 메시지를 버림
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(message)
+            self.delivered += 1
+
+    async def _run(self):
+        while True:
+            pubsub = redisdb.pubsub()
+            try:
+                await pubsub.psubscribe(f"{CHAT_CHANNEL_PREFIX}*")
+                if self.channel_handlers:
+                    await pubsub.subscribe(*self.channel_handlers)
+                async for message in pubsub.listen():
+                    if message["type"] == "pmessage":
+                        user_id = message["channel"][len(CHAT_CHANNEL_PREFIX):]
+                        self.dispatch(user_id, message["data"])
+                    elif message["type"] == "message":
+                        self._call_handler(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"redis subscriber 연결 에러, 재연결 시도: {e}")
+                await asyncio.sleep(self._RECONNECT_DELAY)
+            finally:
+                await pubsub.close()
+
+    def stats(self) -> dict:
+        return {
+            "users": len(self.queues),
+            "queues": sum(len(queues) for queues in self.queues.values()),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
+
+# redis subscriber 싱글톤 패턴
+redis_subscriber = RedisSubscriber()
@@ -1,21 +1,33 @@
+from typing import Optional
+
 from pymongo import MongoClient
 from urllib.parse import quote_plus
-from dotenv import load_dotenv
+from config.settings import load_settings
 import os
 
 # 루트 폴더의 환경 변수 파일 읽어오기
-load_dotenv('.env')
+load_settings()
 
 # Retrieve environment variables or use default values
 DATABASE_URI = os.getenv("DATABASE_URI")
 DATABASE_USERNAME = os.getenv("DATABASE_USERNAME")  
 DATABASE_PASSWORD = os.getenv("DATABASE_PASSWORD")  
-DATABASE_NAME = os.getenv("DATABASE_NAME", "test")
+DATABASE_NAME = os.getenv("DATABASE_NAME", "handsign_db")
 
 username = quote_plus(DATABASE_USERNAME)
 password = quote_plus(DATABASE_PASSWORD)
 
 uri = f"mongodb://{username}:{password}@{DATABASE_URI}/?authSource=admin"
 
-# Create the MongoDB connection
-connection = MongoClient(uri)
\ No newline at end of file
+_connection: Optional[MongoClient] = None
+
+
+def get_connection() -> MongoClient:
+    '''
+    sync MongoClient는 처음 사용할 때 생성 (import 만으로 연결 / monitor thread를 만들지 않음)
+    '''
+    global _connection
+    if _connection is None:
+        # Create the MongoDB connection
+        _connection = MongoClient(uri)
+    return _connection
\ No newline at end of file
@@ -1,30 +1,41 @@
 import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
 
 import redis.asyncio as aioredis
-from dotenv import load_dotenv
+from config.settings import load_settings
 import os
 
+from config.redis_keys import redis_keys
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
-load_dotenv('.env')
+load_settings()
 
 class RedisDB:
     _REDIS_HOST = os.getenv("REDIS_HOST", "redis")
     _REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
     _REDIS_DB = int(os.getenv("REDIS_DB", 0))
+    # worker 당 최대 connection 수, 모두 사용 중이면 REDIS_POOL_TIMEOUT 초까지 대기
+    _REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))
+    _REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", 5))
 
     def __init__(self):
         self.client = None
+        self.pool = None
 
     async def connect(self):
         try:
-            self.client = aioredis.Redis(
+            self.pool = aioredis.BlockingConnectionPool(
                 host=self._REDIS_HOST,
                 port=self._REDIS_PORT,
                 db=self._REDIS_DB,
                 encoding="utf-8",
-                decode_responses=True
+                decode_responses=True,
+                max_connections=self._REDIS_MAX_CONNECTIONS,
+                timeout=self._REDIS_POOL_TIMEOUT,
             )
+            self.client = aioredis.Redis(connection_pool=self.pool)
             # Redis 서버에 PING 명령을 보내 응답을 확인합니다.
             await self.client.ping()
             logger.info("Redis 데이터베이스에 성공적으로 연결되었습니다.")
@@ -34,19 +45,105 @@ class RedisDB:
     async def close(self):
         if self.client:
             await self.client.close()
+            if self.pool:
+                await self.pool.disconnect()
             logger.info("Redis 커넥션 종료.")
 
-    async def set(self, key: str, value: str):
-        await self.client.set(key, value)
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = True) -> AsyncIterator[aioredis.client.Pipeline]:
+        '''
+        여러 명령을 한 번의 왕복으로 전송 (transaction=True 이면 MULTI/EXEC로 원자적으로 실행)
+        블록 안에서 결과가 필요하면 직접 await pipe.execute() 호출, 아니면 블록이 끝날 때 실행
+        '''
+        async with self.client.pipeline(transaction=transaction) as pipe:
+            yield pipe
+            await pipe.execute()
+
+    @staticmethod
+    def _ttl(key: str, ex: Optional[int]) -> int:
+        # key schema(config/redis_keys)에 없는 key는 TTL 없이 쌓이지 않도록 ValueError
+        # ex를 주지 않으면 schema의 TTL 적용
+        family = redis_keys.family_of(key)
+        if family is None:
+            raise ValueError(f"key schema에 없는 redis key: {key!r} (config/redis_keys.py에 등록 필요)")
+        return ex if ex is not None else family.ttl
+
+    async def set(self, key: str, value: str, ex: Optional[int] = None):
+        # SET EX 한 번으로 값과 TTL을 함께 설정
+        await self.client.set(key, value, ex=self._ttl(key, ex))
 
     async def get(self, key: str):
         return await self.client.get(key)
 
+    async def mget(self, *keys: str) -> List[Optional[str]]:
+        if not keys:
+            return []
+        return await self.client.mget(keys)
+
+    async def mset(self, mapping: Dict[str, str], ex: Optional[int] = None):
+        if not mapping:
+            return
+        # MSET은 TTL을 지원하지 않으므로 key마다 SET EX를 transaction으로 묶어서 전송
+        async with self.pipeline() as pipe:
+            for key, value in mapping.items():
+                pipe.set(key, value, ex=self._ttl(key, ex))
+
     async def expire(self, key: str, time: int):
         await self.client.expire(key, time)
 
-    async def delete(self, key: str):
-        await self.client.delete(key)
+    async def delete(self, *keys: str):
+        await self.client.delete(*keys)
+
+    # 값이 일치할 때만 삭제 (GET -> 비교 -> DEL 을 redis 안에서 원자적으로 실행)
+    _DELETE_IF_EQUAL = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+    async def delete_if_equal(self, key: str, value: str) -> bool:
+        return bool(await self.client.eval(self._DELETE_IF_EQUAL, 1, key, value))
+
+    # guard key의 값이 expected 그대로일 때만 SET (없는 key는 빈 문자열로 비교)
+    _SET_IF_UNCHANGED = """
+if (redis.call('GET', KEYS[2]) or '') == ARGV[2] then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[3])
+    return 1
+end
+return 0
+"""
+
+    async def set_if_unchanged(self, key: str, value: str, ex: int, guard_key: str, expected: Optional[str]) -> bool:
+        return bool(await self.client.eval(self._SET_IF_UNCHANGED, 2, key, guard_key, value, expected or "", self._ttl(key, ex)))
+
+    async def hset(self, key: str, mapping: Dict[str, str], ex: Optional[int] = None):
+        # 작은 hash는 listpack으로 저장되어 필드마다 key를 만드는 것보다 메모리를 적게 사용
+        async with self.pipeline() as pipe:
+            pipe.hset(key, mapping=mapping)
+            pipe.expire(key, self._ttl(key, ex))
+
+    async def hgetall(self, key: str) -> Dict[str, str]:
+        return await self.client.hgetall(key)
+
+    async def zadd(self, key: str, mapping: dict):
+        await self.client.zadd(key, mapping)
+
+    async def zcard(self, key: str) -> int:
+        return await self.client.zcard(key)
+
+    async def zpopmin(self, key: str, count: int = 1) -> list:
+        return await self.client.zpopmin(key, count)
+
+    async def xadd(self, key: str, fields: dict, maxlen: int = None) -> str:
+        # maxlen은 근사값(~)으로 trim -> 매 XADD마다 정확히 자르는 비용을 피함
+        return await self.client.xadd(key, fields, maxlen=maxlen, approximate=True)
+
+    async def xrange(self, key: str, min: str = "-", max: str = "+", count: int = None) -> list:
+        return await self.client.xrange(key, min=min, max=max, count=count)
+
+    async def xrevrange(self, key: str, max: str = "+", min: str = "-", count: int = None) -> list:
+        return await self.client.xrevrange(key, max=max, min=min, count=count)
 
     def pubsub(self):
         return self.client.pubsub()
@@ -54,5 +151,17 @@ class RedisDB:
     async def publish(self, channel: str, message: str):
         await self.client.publish(channel, message)
 
+    def pool_stats(self) -> dict:
+        if self.pool is None:
+            return {"max_connections": self._REDIS_MAX_CONNECTIONS, "created": 0, "in_use": 0, "available": 0}
+        in_use = len(getattr(self.pool, "_in_use_connections", ()))
+        available = len([c for c in getattr(self.pool, "_available_connections", ()) if c is not None])
+        return {
+            "max_connections": self._REDIS_MAX_CONNECTIONS,
+            "created": in_use + available,
+            "in_use": in_use,
+            "available": available,
+        }
+
 # Redis 디비 싱글톤 패턴
 redisdb = RedisDB()
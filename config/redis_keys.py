@@ -0,0 +1,72 @@
+from typing import Dict, List, Optional
+
+from config.settings import load_settings
+import os
+
+load_settings()
+
+'''
+redis key schema
+모든 key는 "{prefix}:{id}" 형식이고 prefix 별로 TTL이 정해져 있음 (TTL 없는 key는 만들지 않음)
+'''
+
+
+class RedisKeyFamily:
+    def __init__(self, prefix: str, ttl: int, data_type: str, description: str):
+        if ttl <= 0:
+            raise ValueError(f"redis key family '{prefix}' must have a positive TTL")
+        self.prefix = prefix
+        self.ttl = ttl
+        self.data_type = data_type
+        self.description = description
+
+    def key(self, *parts: str) -> str:
+        return ":".join([self.prefix, *[str(part) for part in parts]])
+
+    @property
+    def pattern(self) -> str:
+        return f"{self.prefix}:*"
+
+
+class RedisKeys:
+    refresh_token = RedisKeyFamily(
+        "refresh_token", int(os.getenv("REFRESH_TOKEN_TTL", 7 * 24 * 60 * 60)), "string",
+        "refresh token -> username",
+    )
+    otp = RedisKeyFamily(
+        "otp", int(os.getenv("OTP_TTL", 30 * 60)), "string",
+        "email -> otp",
+    )
+    chat_stream = RedisKeyFamily(
+        "chat_stream", int(os.getenv("CHAT_STREAM_TTL", 7 * 24 * 60 * 60)), "stream",
+        "사용자별 채팅 기록 (메시지가 추가될 때마다 TTL 갱신)",
+    )
+    video_job = RedisKeyFamily(
+        "video_job", int(os.getenv("VIDEO_JOB_STATUS_TTL", 24 * 60 * 60)), "hash",
+        "video 처리 job 상태 (필드 단위로 갱신)",
+    )
+    inference_cache = RedisKeyFamily(
+        "inference_cache", int(os.getenv("INFERENCE_CACHE_TTL", 7 * 24 * 60 * 60)), "string",
+        "inference 결과 캐시 + LRU index(zset)",
+    )
+    video_cache = RedisKeyFamily(
+        "video_cache", int(os.getenv("DOCUMENT_CACHE_TTL", 300)), "string",
+        "video 단건 조회 캐시",
+    )
+    ws_presence = RedisKeyFamily(
+        "ws_presence", int(os.getenv("WEBSOCKET_PRESENCE_TTL", 30)), "string",
+        "websocket client -> node",
+    )
+
+    def families(self) -> List[RedisKeyFamily]:
+        return [value for value in vars(RedisKeys).values() if isinstance(value, RedisKeyFamily)]
+
+    def family_of(self, key: str) -> Optional[RedisKeyFamily]:
+        prefix = key.split(":", 1)[0]
+        return self._by_prefix().get(prefix) if ":" in key else None
+
+    def _by_prefix(self) -> Dict[str, RedisKeyFamily]:
+        return {family.prefix: family for family in self.families()}
+
+# redis key schema 싱글톤 패턴
+redis_keys = RedisKeys()
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Optional
+
+from config.settings import load_settings
+import os
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+load_settings()
+
+class S3Client:
+    '''
+    boto3 S3 client를 한 번만 생성하고,
+    blocking 호출은 크기가 제한된 thread pool에서 실행하여 event loop를 막지 않음
+    boto3 import / client 생성(수백 ms)은 connect 시 thread pool에서 시작하고 기다리지 않음
+    -> 서버 시작을 늦추지 않고, 처음 S3를 사용하는 요청만 생성이 끝날 때까지 대기
+    '''
+    _AWS_ACCESS_KEY = os.getenv("AWS_ACCESS_KEY")
+    _AWS_SECRET_KEY = os.getenv("AWS_SECRET_KEY")
+    _S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", 32))
+    _S3_TRANSFER_WORKERS = int(os.getenv("S3_TRANSFER_WORKERS", 16))
+    # upload_file / download_file 한 건이 내부적으로 사용하는 thread 수
+    _S3_TRANSFER_CONCURRENCY = int(os.getenv("S3_TRANSFER_CONCURRENCY", 4))
+
+    def __init__(self):
+        self.client = None
+        self.executor = None
+        self.transfer_config = None
+        self._client_ready: Optional[asyncio.Future] = None
+
+    def _create_client(self):
+        import boto3
+        from boto3.s3.transfer import TransferConfig
+        from botocore.config import Config
+
+        self.client = boto3.client(
+            's3',
+            aws_access_key_id=self._AWS_ACCESS_KEY,
+            aws_secret_access_key=self._AWS_SECRET_KEY,
+            config=Config(
+                max_pool_connections=self._S3_MAX_POOL_CONNECTIONS,
+                retries={"max_attempts": 5, "mode": "adaptive"},
+            ),
+        )
+        self.transfer_config = TransferConfig(
+            max_concurrency=self._S3_TRANSFER_CONCURRENCY,
+            use_threads=True,
+        )
+        logger.info("S3 client가 성공적으로 생성되었습니다.")
+
+    async def connect(self):
+        self.executor = ThreadPoolExecutor(
+            max_workers=self._S3_TRANSFER_WORKERS,
+            thread_name_prefix="s3-transfer",
+        )
+        self._client_ready = asyncio.get_running_loop().run_in_executor(self.executor, self._create_client)
+        self._client_ready.add_done_callback(self._log_client_error)
+
+    @staticmethod
+    def _log_client_error(future: asyncio.Future):
+        if not future.cancelled() and future.exception():
+            logger.error(f"S3 client 생성에 실패: {future.exception()}")
+
+    async def _get_client(self):
+        if self._client_ready is None:
+            await self.connect()
+        await asyncio.shield(self._client_ready)
+        return self.client
+
+    async def close(self):
+        self._client_ready = None
+        if self.executor:
+            # 진행 중인 transfer가 끝날 때까지 event loop 밖에서 대기
+            await asyncio.get_running_loop().run_in_executor(None, self.executor.shutdown)
+            self.executor = None
+        if self.client:
+            self.client.close()
+            self.client = None
+            logger.info("S3 client 종료.")
+
+    async def _run(self, method: str, transfer: bool = False, **kwargs):
+        client = await self._get_client()
+        if transfer:
+            # transfer_config는 client와 함께 생성되므로 client 준비 후에 넣음
+            kwargs["Config"] = self.transfer_config
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(getattr(client, method), **kwargs))
+
+    @staticmethod
+    def object_url(bucket_name: str, key: str) -> str:
+        return f"https://{bucket_name}.s3.amazonaws.com/{key}"
+
+    async def presigned_url(self, bucket_name: str, key: str, expires_in: int = 60 * 60) -> str:
+        # 서명만 로컬에서 계산하므로 네트워크 호출 없음
+        client = await self._get_client()
+        return client.generate_presigned_url(
+            'get_object',
+            Params={"Bucket": bucket_name, "Key": key},
+            ExpiresIn=expires_in,
+        )
+
+    async def upload_file(self, file_path: str, bucket_name: str, key: str) -> str:
+        await self._run("upload_file",
+                        Filename=file_path,
+                        Bucket=bucket_name,
+                        Key=key,
+                        transfer=True)
+        return self.object_url(bucket_name, key)
+
+    async def download_file(self, bucket_name: str, key: str, file_path: str) -> str:
+        await self._run("download_file",
+                        Bucket=bucket_name,
+                        Key=key,
+                        Filename=file_path,
+                        transfer=True)
+        return file_path
+
+    async def create_multipart_upload(self, bucket_name: str, key: str) -> str:
+        response = await self._run("create_multipart_upload", Bucket=bucket_name, Key=key)
+        return response["UploadId"]
+
+    async def upload_part(self, bucket_name: str, key: str, upload_id: str, part_number: int, body: bytes) -> dict:
+        response = await self._run("upload_part",
+                                   Bucket=bucket_name,
+                                   Key=key,
+                                   UploadId=upload_id,
+                                   PartNumber=part_number,
+                                   Body=body)
+        return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+    async def complete_multipart_upload(self, bucket_name: str, key: str, upload_id: str, parts: list) -> str:
+        await self._run("complete_multipart_upload",
+                        Bucket=bucket_name,
+                        Key=key,
+                        UploadId=upload_id,
+                        MultipartUpload={"Parts": parts})
+        return self.object_url(bucket_name, key)
+
+    async def abort_multipart_upload(self, bucket_name: str, key: str, upload_id: str):
+        await self._run("abort_multipart_upload",
+                        Bucket=bucket_name,
+                        Key=key,
+                        UploadId=upload_id)
+
+    async def delete_object(self, bucket_name: str, key: str):
+        await self._run("delete_object", Bucket=bucket_name, Key=key)
+
+    @staticmethod
+    def key_of(s3_uri: str) -> str:
+        # object_url의 역변환
+        return s3_uri.split(".s3.amazonaws.com/", 1)[1]
+
+# S3 client 싱글톤 패턴
+s3client = S3Client()
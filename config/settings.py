@@ -0,0 +1,16 @@
+from dotenv import load_dotenv
+
+'''
+.env 로드 (프로세스당 한 번)
+각 모듈은 os.getenv 전에 load_settings()를 호출 -> 처음 호출에서만 파일을 읽음
+'''
+
+_loaded = False
+
+
+def load_settings(path: str = '.env') -> None:
+    global _loaded
+    if _loaded:
+        return
+    load_dotenv(path)
+    _loaded = True
@@ -0,0 +1,110 @@
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Optional, Set
+
+from config.settings import load_settings
+import os
+
+load_settings()
+
+
+class _TokenEntry:
+    __slots__ = ("claims", "user", "expires_at")
+
+    def __init__(self, claims: dict, expires_at: float):
+        self.claims = claims
+        self.user: Optional[Any] = None
+        self.expires_at = expires_at
+
+
+class TokenCache:
+    '''
+    검증된 access token의 claims와 user 문서를 token 기준으로 보관하는 LRU (프로세스 내부)
+    - 만료 시각은 min(저장 시각 + TTL, token의 exp) -> 만료된 token은 절대 반환하지 않음
+    - logout / refresh 시 token 또는 사용자 단위로 삭제
+    '''
+    _CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", 10000))
+    _CACHE_TTL = float(os.getenv("AUTH_TOKEN_CACHE_TTL", 60))
+
+    def __init__(self):
+        self.entries: "OrderedDict[str, _TokenEntry]" = OrderedDict()
+        self.tokens_by_user: Dict[str, Set[str]] = defaultdict(set)
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _get(self, token: str) -> Optional[_TokenEntry]:
+        entry = self.entries.get(token)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.time():
+            self._pop(token)
+            return None
+        self.entries.move_to_end(token)
+        return entry
+
+    def get_claims(self, token: str) -> Optional[dict]:
+        entry = self._get(token)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry.claims
+
+    def get_user(self, token: str) -> Optional[Any]:
+        entry = self._get(token)
+        return entry.user if entry else None
+
+    def set_claims(self, token: str, claims: dict):
+        if self._CACHE_SIZE <= 0:
+            return
+        expires_at = time.time() + self._CACHE_TTL
+        if claims.get("exp"):
+            expires_at = min(expires_at, float(claims["exp"]))
+        self.entries[token] = _TokenEntry(claims, expires_at)
+        self.entries.move_to_end(token)
+        if claims.get("sub"):
+            self.tokens_by_user[claims["sub"]].add(token)
+        while len(self.entries) > self._CACHE_SIZE:
+            self._pop(next(iter(self.entries)))
+
+    def set_user(self, token: str, user: Any):
+        entry = self.entries.get(token)
+        if entry is not None:
+            entry.user = user
+
+    def _pop(self, token: str):
+        entry = self.entries.pop(token, None)
+        if entry is None:
+            return
+        username = entry.claims.get("sub")
+        tokens = self.tokens_by_user.get(username)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                self.tokens_by_user.pop(username, None)
+
+    def invalidate(self, token: str):
+        if token in self.entries:
+            self._pop(token)
+            self.invalidations += 1
+
+    def invalidate_user(self, username: str):
+        for token in list(self.tokens_by_user.get(username, ())):
+            self.invalidate(token)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "max_size": self._CACHE_SIZE,
+            "ttl": self._CACHE_TTL,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+# 검증된 token 캐시 싱글톤 패턴
+token_cache = TokenCache()
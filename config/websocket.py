@@ -1,35 +1,289 @@
 from fastapi import WebSocket, WebSocketDisconnect
 from starlette.websockets import WebSocketState
 from fastapi.responses import HTMLResponse
-from typing import Dict
+from typing import Dict, List, Optional, Set
+
+from config.redis import redisdb
+from config.redis_keys import redis_keys
+from config.pubsub import redis_subscriber
+from config.heartbeat import HeartbeatScheduler
+
+from config.settings import load_settings
+import asyncio
+import json
+import logging
+import os
+import socket
+import uuid
+
+logger = logging.getLogger(__name__)
+load_settings()
+
+class ClientConnection:
+    '''
+    연결 하나의 송신 queue와 writer task
+    broadcast는 queue에 넣기만 하고 실제 전송은 writer task가 순서대로 처리
+    '''
+    def __init__(self, websocket: WebSocket, client_id: str, queue_size: int):
+        self.websocket = websocket
+        self.client_id = client_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.writer: Optional[asyncio.Task] = None
+        self.evicting = False
+        self.last_seen = 0.0
+        self.heartbeat_slot: Optional[int] = None
+
 
 class ConnectionManager:
+    '''
+    websocket 연결 관리
+    WEBSOCKET_MODE=distributed 이면 redis에 presence(client -> node)를 TTL로 기록하고,
+    broadcast / 다른 node에 연결된 client로의 메시지를 redis pub/sub으로 전달
+    연결마다 크기가 제한된 송신 queue를 두고, queue가 넘치거나 전송 timeout이 나면 연결을 끊음
+    '''
+    _WEBSOCKET_MODE = os.getenv("WEBSOCKET_MODE", "local")
+    _SEND_QUEUE_SIZE = int(os.getenv("WEBSOCKET_SEND_QUEUE_SIZE", 256))
+    _SEND_TIMEOUT = float(os.getenv("WEBSOCKET_SEND_TIMEOUT", 5))
+    _HEARTBEAT_INTERVAL = float(os.getenv("WEBSOCKET_HEARTBEAT_INTERVAL", 20))
+    _HEARTBEAT_TIMEOUT = float(os.getenv("WEBSOCKET_HEARTBEAT_TIMEOUT", 60))
+    _HEARTBEAT_SLOTS = int(os.getenv("WEBSOCKET_HEARTBEAT_SLOTS", 20))
+    _PING_MESSAGE = json.dumps({"type": "ping"})
+    _PRESENCE_TTL = redis_keys.ws_presence.ttl
+    _BROADCAST_CHANNEL = "ws_broadcast"
+    _NODE_CHANNEL_PREFIX = "ws_node"
+
     def __init__(self):
-        self.active_connections: Dict[str, WebSocket] = {}
-    
+        self.active_connections: Dict[str, ClientConnection] = {}
+        self.node_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.heartbeat_task: Optional[asyncio.Task] = None
+
+        self.messages_sent = 0
+        self.messages_dropped = 0
+        self.evictions: Dict[str, int] = {"overflow": 0, "timeout": 0, "error": 0, "heartbeat": 0}
+        self.heartbeat = HeartbeatScheduler(
+            interval=self._HEARTBEAT_INTERVAL,
+            timeout=self._HEARTBEAT_TIMEOUT,
+            slots=self._HEARTBEAT_SLOTS,
+            ping=self._ping,
+            reap=self._reap,
+        )
+        self._eviction_tasks: Set[asyncio.Task] = set()
+
+    @property
+    def distributed(self) -> bool:
+        return self._WEBSOCKET_MODE == "distributed"
+
+    @property
+    def node_channel(self) -> str:
+        return f"{self._NODE_CHANNEL_PREFIX}:{self.node_id}"
+
+    def _presence_key(self, client_id: str) -> str:
+        return redis_keys.ws_presence.key(client_id)
+
+    async def start(self):
+        '''
+        redis subscriber 시작 전에 호출해야 node / broadcast 채널이 함께 subscribe 됨
+        '''
+        self.heartbeat.start()
+        if not self.distributed:
+            return
+        redis_subscriber.add_channel_handler(self._BROADCAST_CHANNEL, self._on_broadcast)
+        redis_subscriber.add_channel_handler(self.node_channel, self._on_direct_message)
+        self.heartbeat_task = asyncio.create_task(self._presence_heartbeat())
+        logger.info(f"websocket manager distributed 모드 시작 (node={self.node_id})")
+
     @staticmethod
     def is_socket_connected(websocket: WebSocket) -> bool:
         return websocket.client_state == WebSocketState.CONNECTED and websocket.application_state == WebSocketState.CONNECTED
 
     async def connect(self, websocket: WebSocket, client_id: str):
         await websocket.accept()
-        existing_socket = self.active_connections.get(client_id)
+        existing = self.active_connections.get(client_id)
+        if existing:
+            await self._remove(existing)
+            try:
+                if self.is_socket_connected(existing.websocket):
+                    await existing.websocket.close()
+            except Exception as e:
+                print(f"Error closing WebSocket: {e}")
+
+        connection = ClientConnection(websocket, client_id, self._SEND_QUEUE_SIZE)
+        connection.writer = asyncio.create_task(self._write(connection))
+        websocket.state.connection = connection
+        self.active_connections[client_id] = connection
+        self.heartbeat.register(connection)
+        if self.distributed:
+            await self._set_presence(client_id)
+
+    async def disconnect(self, websocket: WebSocket, client_id: str):
+        # 같은 client_id로 새로 연결된 socket은 유지
+        connection = self.active_connections.get(client_id)
+        if connection is None or connection.websocket is not websocket:
+            return
+        await self._remove(connection)
+
+    async def _remove(self, connection: ClientConnection):
+        if self.active_connections.get(connection.client_id) is connection:
+            self.active_connections.pop(connection.client_id, None)
+        self.heartbeat.unregister(connection)
+        if connection.writer and connection.writer is not asyncio.current_task():
+            connection.writer.cancel()
+        if self.distributed:
+            # 다른 node가 이미 가져간 presence는 지우지 않음
+            await redisdb.delete_if_equal(self._presence_key(connection.client_id), self.node_id)
+
+    def _enqueue(self, connection: ClientConnection, message: str):
         try:
-            if existing_socket and self.is_socket_connected(existing_socket):
-                await existing_socket.close()
-        except Exception as e:
-            print(f"Error closing WebSocket: {e}")
-            
-        self.active_connections[client_id] = websocket
+            connection.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # 읽지 못하는 client 때문에 다른 client가 늦어지지 않도록 연결을 끊음
+            self.messages_dropped += 1
+            if not connection.evicting:
+                task = asyncio.create_task(self._evict(connection, "overflow"))
+                self._eviction_tasks.add(task)
+                task.add_done_callback(self._eviction_tasks.discard)
 
-    def disconnect(self, websocket: WebSocket, client_id: str):
-        self.active_connections.pop(client_id, None)
+    async def _write(self, connection: ClientConnection):
+        while True:
+            message = await connection.queue.get()
+            try:
+                await asyncio.wait_for(connection.websocket.send_text(message), self._SEND_TIMEOUT)
+                self.messages_sent += 1
+            except asyncio.TimeoutError:
+                await self._evict(connection, "timeout")
+                return
+            except Exception:
+                await self._evict(connection, "error")
+                return
+
+    def touch(self, websocket: WebSocket):
+        '''
+        client로부터 메시지(pong 포함)를 받을 때마다 호출 -> last_seen 갱신
+        '''
+        connection = getattr(websocket.state, "connection", None)
+        if connection is not None:
+            self.heartbeat.touch(connection)
+
+    def _ping(self, connection: ClientConnection):
+        self._enqueue(connection, self._PING_MESSAGE)
+
+    async def _reap(self, connections: List[ClientConnection]):
+        await asyncio.gather(*[self._evict(connection, "heartbeat") for connection in connections])
+
+    async def _evict(self, connection: ClientConnection, reason: str):
+        if connection.evicting or self.active_connections.get(connection.client_id) is not connection:
+            return
+        connection.evicting = True
+        self.evictions[reason] += 1
+        self.messages_dropped += connection.queue.qsize()
+        logger.info(f"websocket 연결 해제 ({connection.client_id}, reason={reason})")
+        await self._remove(connection)
+        try:
+            # 1013 : try again later
+            await asyncio.wait_for(connection.websocket.close(code=1013), self._SEND_TIMEOUT)
+        except Exception:
+            pass
 
     async def send_personal_message(self, message: str, websocket: WebSocket):
-        await websocket.send_text(message)
+        connection = getattr(websocket.state, "connection", None)
+        if connection is None:
+            await websocket.send_text(message)
+            return
+        self._enqueue(connection, message)
+
+    async def send_to(self, client_id: str, message: str) -> bool:
+        '''
+        client_id에게 메시지 전달 (로컬 연결이면 송신 queue에 넣고, 아니면 해당 node로 전달)
+        '''
+        connection = self.active_connections.get(client_id)
+        if connection:
+            self._enqueue(connection, message)
+            return True
+        if not self.distributed:
+            return False
+
+        node_id = await self.get_presence(client_id)
+        if not node_id:
+            return False
+        await redisdb.publish(
+            f"{self._NODE_CHANNEL_PREFIX}:{node_id}",
+            json.dumps({"client_id": client_id, "message": message}),
+        )
+        return True
 
     async def broadcast(self, message: str):
-        for connection in self.active_connections.values():
-            await connection.send_text(message)
+        self._broadcast_local(message)
+        if self.distributed:
+            await redisdb.publish(
+                self._BROADCAST_CHANNEL,
+                json.dumps({"origin": self.node_id, "message": message}),
+            )
+
+    def _broadcast_local(self, message: str):
+        # 전송을 기다리지 않으므로 가장 느린 client와 무관하게 바로 끝남
+        for connection in list(self.active_connections.values()):
+            self._enqueue(connection, message)
+
+    async def get_presence(self, client_id: str) -> Optional[str]:
+        return await redisdb.get(self._presence_key(client_id))
+
+    async def _set_presence(self, client_id: str):
+        await redisdb.set(self._presence_key(client_id), self.node_id, ex=self._PRESENCE_TTL)
+
+    async def _presence_heartbeat(self):
+        # TTL이 끝나기 전에 로컬 client들의 presence를 갱신 (node가 죽으면 자동 만료)
+        # 연결 수와 무관하게 한 번의 왕복으로 모두 갱신
+        while True:
+            await asyncio.sleep(self._PRESENCE_TTL / 3)
+            client_ids = list(self.active_connections)
+            if not client_ids:
+                continue
+            try:
+                await redisdb.mset(
+                    {self._presence_key(client_id): self.node_id for client_id in client_ids},
+                    ex=self._PRESENCE_TTL,
+                )
+            except Exception as e:
+                logger.error(f"presence 갱신 실패 ({len(client_ids)}개): {e}")
+
+    def _on_broadcast(self, data: str):
+        payload = json.loads(data)
+        if payload["origin"] == self.node_id:
+            return
+        self._broadcast_local(payload["message"])
+
+    def _on_direct_message(self, data: str):
+        payload = json.loads(data)
+        connection = self.active_connections.get(payload["client_id"])
+        if connection:
+            self._enqueue(connection, payload["message"])
+
+    def stats(self) -> dict:
+        depths = [connection.queue.qsize() for connection in self.active_connections.values()]
+        return {
+            "node_id": self.node_id,
+            "connections": len(depths),
+            "queued_messages": sum(depths),
+            "max_queue_depth": max(depths, default=0),
+            "messages_sent": self.messages_sent,
+            "messages_dropped": self.messages_dropped,
+            "evictions": dict(self.evictions),
+            "heartbeat": self.heartbeat.stats(),
+        }
+
+    async def close_all_connections(self):
+        await self.heartbeat.close()
+        if self.heartbeat_task:
+            self.heartbeat_task.cancel()
+            await asyncio.gather(self.heartbeat_task, return_exceptions=True)
+            self.heartbeat_task = None
+
+        for connection in list(self.active_connections.values()):
+            await self._remove(connection)
+            try:
+                if self.is_socket_connected(connection.websocket):
+                    await connection.websocket.close()
+            except Exception as e:
+                print(f"Error closing WebSocket: {e}")
 
-websocket_manager = ConnectionManager()
\ No newline at end of file
+websocket_manager = ConnectionManager()
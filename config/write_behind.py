@@ -0,0 +1,211 @@
+import asyncio
+import logging
+import time
+from typing import Any, List, Optional, Tuple
+
+from beanie import PydanticObjectId
+from pymongo.errors import BulkWriteError, ConnectionFailure, ExecutionTimeout, WTimeoutError
+
+from config.settings import load_settings
+import os
+
+from models.video import UserChatModel
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+load_settings()
+
+# close 시 runner에게 남은 문서를 flush 하고 종료하라는 신호
+_DRAIN = object()
+
+# 다시 시도하면 성공할 수 있는 에러 (연결 끊김, primary 변경, timeout)
+_TRANSIENT_ERRORS = (ConnectionFailure, ExecutionTimeout, WTimeoutError)
+_DUPLICATE_KEY = 11000
+
+
+class WriteBehindFull(Exception):
+    pass
+
+
+class WriteBehindBuffer:
+    '''
+    beanie Document를 모아서 batch 크기 또는 flush 간격마다 insert_many 한 번으로 저장하는 write-behind buffer
+    - async : queue에 넣고 바로 반환 (queue가 가득 차면 WriteBehindFull)
+    - sync  : 해당 문서가 포함된 batch의 insert_many가 끝날 때까지 대기
+    종료 시 queue에 남은 문서를 모두 flush
+    일시적인 에러는 CHAT_WRITE_MAX_RETRIES 번까지 backoff 후 재시도,
+    BulkWriteError는 writeErrors에 있는 문서만 실패로 처리 (ordered=False 이므로 나머지는 저장됨)
+    '''
+    _BATCH_SIZE = int(os.getenv("CHAT_WRITE_BATCH_SIZE", 500))
+    _FLUSH_INTERVAL_MS = float(os.getenv("CHAT_WRITE_FLUSH_INTERVAL_MS", 200))
+    _MAX_QUEUE_SIZE = int(os.getenv("CHAT_WRITE_QUEUE_SIZE", 10000))
+    _DURABILITY = os.getenv("CHAT_WRITE_DURABILITY", "async")
+    _DRAIN_TIMEOUT = float(os.getenv("CHAT_WRITE_DRAIN_TIMEOUT", 10))
+    _MAX_RETRIES = int(os.getenv("CHAT_WRITE_MAX_RETRIES", 3))
+    _RETRY_BACKOFF_MS = float(os.getenv("CHAT_WRITE_RETRY_BACKOFF_MS", 100))
+
+    def __init__(self, model, name: str):
+        self.model = model
+        self.name = name
+        self.queue: Optional[asyncio.Queue] = None
+        self.runner: Optional[asyncio.Task] = None
+
+        self.flushes = 0
+        self.documents = 0
+        self.errors = 0
+        self.retries = 0
+        self.lost = 0
+        self.max_queue_depth = 0
+        self.total_flush_seconds = 0.0
+
+    @property
+    def durability(self) -> str:
+        return self._DURABILITY
+
+    async def start(self):
+        self.queue = asyncio.Queue(maxsize=self._MAX_QUEUE_SIZE)
+        self.runner = asyncio.create_task(self._run())
+        logger.info(
+            f"{self.name} write-behind buffer 시작 "
+            f"(batch_size={self._BATCH_SIZE}, flush_interval_ms={self._FLUSH_INTERVAL_MS}, durability={self._DURABILITY})"
+        )
+
+    async def close(self):
+        if self.runner is None:
+            return
+        queue = self.queue
+        # 새 문서는 받지 않고 runner가 남은 문서를 모두 저장하도록 신호를 보냄
+        self.queue = None
+        await queue.put(_DRAIN)
+        try:
+            await asyncio.wait_for(self.runner, self._DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            remaining = queue.qsize()
+            self.lost += remaining
+            logger.error(f"{self.name} write-behind buffer drain timeout, {remaining}개 문서 저장 실패")
+        self.runner = None
+        logger.info(f"{self.name} write-behind buffer 종료.")
+
+    async def add(self, document: Any):
+        if self.queue is None or self.queue.full():
+            raise WriteBehindFull(f"{self.name} write-behind buffer queue is full")
+
+        future = asyncio.get_running_loop().create_future() if self._DURABILITY == "sync" else None
+        self.queue.put_nowait((document, future))
+        self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+        if future is not None:
+            await future
+
+    async def _collect(self, queue: asyncio.Queue) -> Tuple[List[Tuple[Any, Optional[asyncio.Future]]], bool]:
+        first = await queue.get()
+        if first is _DRAIN:
+            return [], True
+
+        batch = [first]
+        deadline = time.monotonic() + self._FLUSH_INTERVAL_MS / 1000
+        while len(batch) < self._BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                entry = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if entry is _DRAIN:
+                return batch, True
+            batch.append(entry)
+        return batch, False
+
+    async def _run(self):
+        queue = self.queue
+        draining = False
+        while True:
+            if draining:
+                # 종료 중에는 기다리지 않고 남은 문서만 batch 단위로 저장
+                batch = []
+                while len(batch) < self._BATCH_SIZE and not queue.empty():
+                    entry = queue.get_nowait()
+                    if entry is not _DRAIN:
+                        batch.append(entry)
+                if not batch:
+                    return
+            else:
+                batch, draining = await self._collect(queue)
+                if not batch:
+                    continue
+            await self._flush(batch)
+
+    async def _insert(self, documents: List[Any]) -> dict:
+        '''
+        insert_many (일시적인 에러는 backoff 후 재시도) -> 실패한 문서 index: 에러 메시지
+        '''
+        # 재시도 때 같은 _id로 insert 되도록 미리 지정 (이전 시도에서 저장된 문서는 duplicate key)
+        for document in documents:
+            if document.id is None:
+                document.id = PydanticObjectId()
+
+        attempt = 0
+        while True:
+            try:
+                await self.model.insert_many(documents, ordered=False)
+                return {}
+            except BulkWriteError as e:
+                return {
+                    error["index"]: error.get("errmsg", str(e))
+                    for error in e.details.get("writeErrors", [])
+                    if not (attempt and error.get("code") == _DUPLICATE_KEY)
+                }
+            except _TRANSIENT_ERRORS as e:
+                if attempt >= self._MAX_RETRIES:
+                    raise
+                attempt += 1
+                self.retries += 1
+                backoff = self._RETRY_BACKOFF_MS * 2 ** (attempt - 1) / 1000
+                logger.warning(f"{self.name} write-behind flush 재시도 {attempt}/{self._MAX_RETRIES} ({backoff:.2f}s 후): {e}")
+                await asyncio.sleep(backoff)
+
+    def _fail(self, failures: List[Tuple[Optional[asyncio.Future], Exception]]):
+        self.errors += 1
+        if self._DURABILITY != "sync":
+            self.lost += len(failures)
+        for future, error in failures:
+            if future is not None and not future.done():
+                future.set_exception(error)
+
+    async def _flush(self, batch: List[Tuple[Any, Optional[asyncio.Future]]]):
+        started_at = time.monotonic()
+        try:
+            failed = await self._insert([document for document, _ in batch])
+            if failed:
+                logger.error(f"{self.name} write-behind flush 일부 실패 ({len(failed)}/{len(batch)}개): {next(iter(failed.values()))}")
+                self._fail([(batch[index][1], RuntimeError(message)) for index, message in failed.items()])
+            for index, (_, future) in enumerate(batch):
+                if index not in failed and future is not None and not future.done():
+                    future.set_result(None)
+        except Exception as e:
+            logger.error(f"{self.name} write-behind flush 실패 ({len(batch)}개): {e}")
+            self._fail([(future, e) for _, future in batch])
+        finally:
+            self.flushes += 1
+            self.documents += len(batch)
+            self.total_flush_seconds += time.monotonic() - started_at
+
+    def stats(self) -> dict:
+        return {
+            "durability": self._DURABILITY,
+            "batch_size": self._BATCH_SIZE,
+            "flush_interval_ms": self._FLUSH_INTERVAL_MS,
+            "max_queue_size": self._MAX_QUEUE_SIZE,
+            "queue_depth": self.queue.qsize() if self.queue else 0,
+            "max_queue_depth": self.max_queue_depth,
+            "flushes": self.flushes,
+            "documents": self.documents,
+            "errors": self.errors,
+            "retries": self.retries,
+            "lost": self.lost,
+            "avg_batch_size": self.documents / self.flushes if self.flushes else 0.0,
+            "avg_flush_ms": self.total_flush_seconds * 1000 / self.flushes if self.flushes else 0.0,
+        }
+
+# 채팅 메시지 write-behind buffer 싱글톤 패턴
+chat_write_buffer = WriteBehindBuffer(UserChatModel, "user_chat")
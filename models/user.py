@@ -1,11 +1,12 @@
 from pydantic import BaseModel, Field
 from beanie.odm.documents import Document
-from beanie.odm.fields import PydanticObjectId
+from beanie.odm.fields import PydanticObjectId, Indexed
 from typing import Optional
 from datetime import datetime, timedelta
 
 class User(Document):
-    username: str
+    # 로그인 / 회원가입 / 토큰 확인마다 username으로 조회
+    username: Indexed(str, unique=True)
     hashed_password: str
     password: Optional[str] = None
 
@@ -1,7 +1,11 @@
 from pydantic import BaseModel, HttpUrl, constr, validator
-from beanie import Document, Indexed, init_beanie, PydanticObjectId
+from beanie import Document, Indexed, init_beanie, PydanticObjectId, UpdateResponse
+from beanie.odm.utils.dump import get_dict
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, DeleteMany, IndexModel, InsertOne, UpdateMany
+from pymongo.results import BulkWriteResult
 
-from typing import Optional, List, Any 
+from typing import Optional, List, Any, Tuple
 '''
 모델 스키마 정의 (테이블 입력 양식)
 '''
@@ -10,17 +14,54 @@ class VideoData(BaseModel):
     user_id: str
     sentence: str
 
+
+# 사용자별 최신순 조회용 index (_id(ObjectId)가 생성 시각 순서이므로 생성 시각 대신 사용)
+USER_RECENT_INDEX = IndexModel([("user_id", ASCENDING), ("_id", DESCENDING)], name="user_id_created")
+
 class VideoDataModel(Document, VideoData):
     s3_uri: str
+    # 업로드 파일의 SHA-256 (중복 업로드 확인용)
+    content_hash: Optional[str] = None
     # collection name을 여기서 지정가능
     class Settings:
         name = "video"
         use_revision = False
+        indexes = [
+            USER_RECENT_INDEX,
+            # 같은 사용자의 같은 content는 문서 하나 (content_hash가 있는 문서만 대상)
+            # content_hash로 시작하므로 hash만으로 찾는 중복 확인도 이 index 사용
+            IndexModel(
+                [("content_hash", ASCENDING), ("user_id", ASCENDING)],
+                name="content_hash_user",
+                unique=True,
+                partialFilterExpression={"content_hash": {"$exists": True}},
+            ),
+        ]
+        # content_hash가 None이면 필드를 저장하지 않음 (partial index 대상에서 제외)
+        keep_nulls = False
 
 class UserChatModel(Document, VideoData):
     class Settings:
         name = "user_chat"
         use_revision = False
+        indexes = [USER_RECENT_INDEX]
+
+class InferenceCacheModel(Document):
+    # (content hash, model version, 전처리 파라미터) 기준 inference 결과 캐시
+    cache_key: Indexed(str, unique=True)
+    content_hash: str
+    model_version: str
+    params: dict
+    sentence: str
+
+    class Settings:
+        name = "inference_cache"
+        use_revision = False
+
+
+class VideoDataCreate(VideoData):
+    s3_uri: str
+    content_hash: Optional[str] = None
 
 
 class VideoDataUpdate(BaseModel):
@@ -29,6 +70,20 @@ class VideoDataUpdate(BaseModel):
     sentence: Optional[str] = None
 
 
+class VideoBulkUpdate(BaseModel):
+    # filter에 지정한 필드가 모두 일치하는 문서에 update 필드를 $set
+    filter: VideoDataUpdate
+    update: VideoDataUpdate
+
+
+class VideoBulkUpdateRequest(BaseModel):
+    updates: List[VideoBulkUpdate]
+
+
+class VideoBulkDeleteRequest(BaseModel):
+    ids: List[PydanticObjectId]
+
+
 class Database:
     def __init__(self, model):
         self.model = model
@@ -49,32 +104,86 @@ class Database:
             return doc
         return False
 
+    async def get_latest(self, query: dict) -> Any:
+        # _id 내림차순 첫 문서 (가장 최근에 저장된 문서), user_id 조건이면 USER_RECENT_INDEX 사용
+        return await self.model.find(query).sort([("_id", DESCENDING)]).first_or_none()
+
+    def find_raw(self,
+                 query: dict,
+                 projection: Optional[dict] = None,
+                 after: Optional[ObjectId] = None,
+                 limit: int = 0,
+                 batch_size: int = 100):
+        '''
+        _id 오름차순 keyset pagination cursor
+        모델로 변환하지 않은 dict를 batch_size 단위로 가져오므로 결과 크기와 무관하게 메모리 사용량이 일정
+        '''
+        if after is not None:
+            query = {**query, "_id": {**query.get("_id", {}), "$gt": after}}
+        cursor = self.model.get_motor_collection().find(query, projection).sort("_id", 1).batch_size(batch_size)
+        if limit:
+            cursor = cursor.limit(limit)
+        return cursor
+
     async def get_all(self) -> List[Any]:
         docs = await self.model.find_all().to_list()
         if docs:
             return docs 
         return False
 
-    async def update(self, id: PydanticObjectId, body: BaseModel) -> Any:
-        doc_id = id 
-        des_body = body.dict() 
+    @staticmethod
+    def update_fields(body: BaseModel) -> dict:
+        des_body = body.dict()
         des_body = {k: v for k, v in des_body.items() if v is not None}
-        
+
         des_body.pop("id", None)
-        des_body.pop("_id", None)  
+        des_body.pop("_id", None)
+        return des_body
+
+    async def update(self, id: PydanticObjectId, body: BaseModel) -> Any:
+        '''
+        find_one_and_update 한 번으로 수정하고 수정 후 문서를 반환 (조회 후 수정 사이의 race 없음)
+        '''
+        des_body = self.update_fields(body)
+        if not des_body:
+            return await self.get_by_obj_id(id)
 
         update_query = {"$set": des_body}
-        
-        update_doc = await self.model.get(doc_id)
+
+        update_doc = await self.model.find_one({"_id": id}).update(
+            update_query, response_type=UpdateResponse.NEW_DOCUMENT
+        )
         if not update_doc:
             return False
-
-        await update_doc.update(update_query)
         return update_doc
-    
-    async def delete(self, id:PydanticObjectId) -> bool:
-        doc = await self.model.get(id)
-        if not doc:
-            return False
-        await doc.delete()
-        return True
\ No newline at end of file
+
+    async def delete(self, id: PydanticObjectId) -> bool:
+        result = await self.model.get_motor_collection().delete_one({"_id": id})
+        return result.deleted_count > 0
+
+    async def bulk_write(self, operations: list, ordered: bool = False) -> BulkWriteResult:
+        '''
+        여러 작업을 bulk_write 한 번으로 전송 (driver가 maxWriteBatchSize 단위로 나눠서 보냄)
+        ordered=False 이면 중간에 실패한 작업이 있어도 나머지를 계속 처리
+        '''
+        return await self.model.get_motor_collection().bulk_write(operations, ordered=ordered)
+
+    async def bulk_insert(self, documents: list) -> BulkWriteResult:
+        return await self.bulk_write([
+            InsertOne(get_dict(document, to_db=True, keep_nulls=document.get_settings().keep_nulls))
+            for document in documents
+        ])
+
+    async def bulk_update(self, updates: List[Tuple[dict, BaseModel]]) -> BulkWriteResult:
+        '''
+        (filter, 수정할 필드) 목록을 filter 별 update_many로 처리
+        '''
+        operations = [UpdateMany(query, {"$set": self.update_fields(body)}) for query, body in updates]
+        return await self.bulk_write(operations)
+
+    async def bulk_delete(self, ids: List[PydanticObjectId], chunk_size: int = 10000) -> BulkWriteResult:
+        operations = [
+            DeleteMany({"_id": {"$in": ids[i:i + chunk_size]}})
+            for i in range(0, len(ids), chunk_size)
+        ]
+        return await self.bulk_write(operations)
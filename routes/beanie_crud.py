@@ -1,12 +1,23 @@
 from beanie import PydanticObjectId
-from fastapi import APIRouter, Depends, HTTPException, status
+from bson import ObjectId
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 
-from models.video import VideoData, VideoDataModel, VideoDataUpdate, Database
-from typing import List
+from models.video import (VideoData, VideoDataModel, VideoDataUpdate, VideoDataCreate,
+                          VideoBulkUpdateRequest, VideoBulkDeleteRequest, Database)
+from pymongo.errors import BulkWriteError
+from config.document_cache import video_cache
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+import json
 
 video_database = Database(VideoDataModel)
 crud_router = APIRouter()
 
+# 목록 조회 시 projection으로 선택할 수 있는 필드
+VIDEO_LIST_FIELDS = {"user_id", "sentence", "s3_uri", "content_hash"}
+VIDEO_LIST_MAX_LIMIT = 500
+
 @crud_router.post("/save_video", response_model=dict, status_code=201)
 async def save_s3_uri_db(video_body: VideoData):
     video_data = VideoDataModel(**video_body.dict())
@@ -24,7 +35,8 @@ async def save_s3_uri_db(video_body: VideoData):
 
 @crud_router.get("/get_video/{id}", response_model=VideoDataModel, status_code=200)
 async def get_video_data_by_obj_id(id: PydanticObjectId) -> VideoDataModel:
-    video_data = await video_database.get_by_obj_id(id)
+    # LRU -> redis -> mongo 순서로 조회
+    video_data = await video_cache.get_or_load(id, lambda: video_database.get_by_obj_id(id))
     
     if video_data:
         return video_data
@@ -33,16 +45,79 @@ async def get_video_data_by_obj_id(id: PydanticObjectId) -> VideoDataModel:
         detail="video data를 찾을 수 없습니다"
         )
 
-@crud_router.get("/get_video/", response_model=List[VideoDataModel], status_code=200)
-async def get_all_video_data() -> List[VideoDataModel]:
-    video_datas = await video_database.get_all()
-    
-    if video_datas:
-        return video_datas
-    raise HTTPException(
-        status_code=status.HTTP_404_NOT_FOUND, 
-        detail="video data를 가져오는 데 에러가 발생하였습니다."
-        )
+def _video_list_query(user_id: Optional[str],
+                      start: Optional[datetime],
+                      end: Optional[datetime]) -> Dict[str, Any]:
+    # _id(ObjectId)에 생성 시각이 들어 있으므로 날짜 범위도 _id 범위로 조회
+    query: Dict[str, Any] = {}
+    if user_id:
+        query["user_id"] = user_id
+    id_range = {}
+    if start:
+        id_range["$gte"] = ObjectId.from_datetime(start)
+    if end:
+        id_range["$lt"] = ObjectId.from_datetime(end)
+    if id_range:
+        query["_id"] = id_range
+    return query
+
+
+def _video_list_projection(fields: Optional[str]) -> Optional[Dict[str, int]]:
+    if not fields:
+        return None
+    selected = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = selected - VIDEO_LIST_FIELDS
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"선택할 수 없는 필드 : {', '.join(sorted(unknown))}"
+            )
+    return {field: 1 for field in selected}
+
+
+def _serialize_video(doc: Dict[str, Any]) -> Dict[str, Any]:
+    doc["id"] = str(doc.pop("_id"))
+    doc.pop("revision_id", None)
+    return doc
+
+
+async def _ndjson_lines(cursor) -> AsyncIterator[str]:
+    # cursor가 batch 단위로 가져오는 문서를 한 줄씩 바로 내보냄
+    async for doc in cursor:
+        yield json.dumps(_serialize_video(doc), ensure_ascii=False) + "\n"
+
+
+@crud_router.get("/get_video/", status_code=200)
+async def get_all_video_data(
+        after: Optional[PydanticObjectId] = None,
+        limit: int = Query(50, ge=1, le=VIDEO_LIST_MAX_LIMIT),
+        user_id: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        fields: Optional[str] = None,
+        stream: bool = False):
+    '''
+    _id 기준 keyset pagination
+    - 응답의 next_after를 다음 요청의 after로 넘기면 이어서 조회 (더 없으면 null)
+    - stream=true 이면 limit 없이 조건에 맞는 문서 전체를 NDJSON으로 전송
+    '''
+    query = _video_list_query(user_id, start, end)
+    projection = _video_list_projection(fields)
+
+    if stream:
+        cursor = video_database.find_raw(query, projection, after=after)
+        return StreamingResponse(_ndjson_lines(cursor), media_type="application/x-ndjson")
+
+    # 다음 페이지 유무 확인을 위해 하나 더 조회
+    cursor = video_database.find_raw(query, projection, after=after, limit=limit + 1, batch_size=limit + 1)
+    docs = [_serialize_video(doc) for doc in await cursor.to_list(length=limit + 1)]
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+
+    return {
+        "items": docs,
+        "next_after": docs[-1]["id"] if has_more else None,
+    }
 
 @crud_router.put("/update_video/{id}", response_model=VideoDataModel, status_code=200)
 async def update_video_data(id: PydanticObjectId, body: VideoDataUpdate) -> VideoDataModel:
@@ -50,6 +125,7 @@ async def update_video_data(id: PydanticObjectId, body: VideoDataUpdate) -> Vide
     issue : response id에서 revision_id가 나오는 문제
     '''
     updated_video_data = await video_database.update(id, body)
+    await video_cache.invalidate([id])
     
     if not updated_video_data:
         raise HTTPException(
@@ -62,6 +138,7 @@ async def update_video_data(id: PydanticObjectId, body: VideoDataUpdate) -> Vide
 @crud_router.delete("/delete_video/{id}", response_model=dict, status_code=200)
 async def delete_video_data(id: PydanticObjectId) -> dict:
     deleted_video_data = await video_database.delete(id)
+    await video_cache.invalidate([id])
     
     if not deleted_video_data:
         raise HTTPException(
@@ -72,4 +149,114 @@ async def delete_video_data(id: PydanticObjectId) -> dict:
     return {
         "status": "success", 
         "message": "video data를 삭제하였습니다."
-    }
\ No newline at end of file
+    }
+
+
+@crud_router.get("/cache/video/stats", response_model=dict, status_code=200)
+async def get_video_cache_stats() -> dict:
+    '''
+    현재 worker의 video 단건 조회 캐시 hit ratio
+    '''
+    return video_cache.stats()
+
+
+def _bulk_result(result) -> Dict[str, int]:
+    return {
+        "inserted": result.inserted_count,
+        "matched": result.matched_count,
+        "modified": result.modified_count,
+        "deleted": result.deleted_count,
+    }
+
+
+def _bulk_error(e: BulkWriteError) -> HTTPException:
+    # ordered=False 이므로 실패한 작업 외에는 반영된 상태
+    details = e.details
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail={
+            "message": "일부 작업이 실패하였습니다.",
+            "inserted": details.get("nInserted", 0),
+            "matched": details.get("nMatched", 0),
+            "modified": details.get("nModified", 0),
+            "deleted": details.get("nRemoved", 0),
+            "errors": [error.get("errmsg") for error in details.get("writeErrors", [])[:10]],
+        }
+        )
+
+
+def _require_items(items: list):
+    if not items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="처리할 항목이 없습니다."
+            )
+
+
+@crud_router.post("/bulk/save_video", response_model=dict, status_code=201)
+async def bulk_save_video_data(video_bodies: List[VideoDataCreate]) -> dict:
+    _require_items(video_bodies)
+    documents = [VideoDataModel(**video_body.dict()) for video_body in video_bodies]
+    try:
+        result = await video_database.bulk_insert(documents)
+    except BulkWriteError as e:
+        raise _bulk_error(e)
+
+    return {
+        "status": "success",
+        "message": "video data를 bulk 저장",
+        "result": _bulk_result(result)
+    }
+
+
+@crud_router.put("/bulk/update_video", response_model=dict, status_code=200)
+async def bulk_update_video_data(body: VideoBulkUpdateRequest) -> dict:
+    '''
+    filter 별로 update_many를 만들어 bulk_write 한 번으로 처리
+    '''
+    _require_items(body.updates)
+    updates = []
+    for item in body.updates:
+        query = video_database.update_fields(item.filter)
+        fields = video_database.update_fields(item.update)
+        if not query or not fields:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="filter와 update에는 최소 한 개의 필드가 필요합니다."
+                )
+        updates.append((query, item.update))
+
+    # 수정 대상 문서의 캐시를 지우기 위해 id만 먼저 조회
+    ids = []
+    for query, _ in updates:
+        ids.extend([doc["_id"] async for doc in video_database.find_raw(query, {"_id": 1}, batch_size=1000)])
+
+    try:
+        result = await video_database.bulk_update(updates)
+    except BulkWriteError as e:
+        raise _bulk_error(e)
+    finally:
+        await video_cache.invalidate(ids)
+
+    return {
+        "status": "success",
+        "message": "video data를 bulk 수정",
+        "result": _bulk_result(result)
+    }
+
+
+@crud_router.post("/bulk/delete_video", response_model=dict, status_code=200)
+async def bulk_delete_video_data(body: VideoBulkDeleteRequest) -> dict:
+    _require_items(body.ids)
+    try:
+        result = await video_database.bulk_delete(body.ids)
+    except BulkWriteError as e:
+        raise _bulk_error(e)
+    finally:
+        await video_cache.invalidate(body.ids)
+
+    return {
+        "status": "success",
+        "message": "video data를 bulk 삭제",
+        "result": _bulk_result(result)
+    }
@@ -6,10 +6,13 @@ from models.video import VideoData, VideoDataModel, VideoDataUpdate, UserChatMod
 
 from config.redis import redisdb
 from config.websocket import websocket_manager
-from wsproto.utilities import LocalProtocolError
+from config.pubsub import redis_subscriber
+from config.chat_stream import chat_stream, parse_stream_id
+from config.write_behind import chat_write_buffer, WriteBehindFull
 
 from beanie import PydanticObjectId
-from typing import List
+from typing import List, Optional
+import json
 import logging
 import time
 import asyncio
@@ -20,116 +23,183 @@ chat_router = APIRouter()
 chat_database = Database(UserChatModel)
 logger = logging.getLogger(__name__)
 
-HEART_BEAT_INTERVAL = 5
-async def is_websocket_active(ws: WebSocket) -> bool:
-    if not (ws.application_state == WebSocketState.CONNECTED and ws.client_state == WebSocketState.CONNECTED):
-        return False
-    try:
-        await asyncio.wait_for(ws.send_json({'type': 'ping'}), HEART_BEAT_INTERVAL)
-        message = await asyncio.wait_for(ws.receive_json(), HEART_BEAT_INTERVAL)
-        assert message['type'] == 'pong'
-    except BaseException:  # asyncio.TimeoutError and ws.close()
-        return False
-    return True
+
+async def _receive_until_disconnect(websocket: WebSocket):
+    # client가 보내는 메시지(pong 등)는 heartbeat last_seen 갱신에만 사용하고 연결 종료를 감지
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+        websocket_manager.touch(websocket)
+
+
+async def _wait_first(*tasks: asyncio.Task):
+    # 먼저 끝난 task의 예외를 전달하고 나머지는 정리
+    done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    for task in done:
+        task.result()
 
 
 @chat_router.websocket("/ws/chat/{user_id}")
 async def websocket_endpoint(websocket: WebSocket, user_id: str):
+    '''
+    redis polling 없이 chat_{user_id} 채널에 publish 되는 즉시 전달
+    (프로세스 공용 redis subscriber의 사용자 queue 사용)
+    '''
     await websocket_manager.connect(websocket, user_id)
-    try:
+    queue = redis_subscriber.subscribe(user_id)
+
+    async def _deliver():
         while True:
-            # Before processing, check if the WebSocket connection is still active
-            if not await is_websocket_active(websocket):
-                break
-
-            user_data = await redisdb.get(user_id)
-            await asyncio.sleep(3)
-            
-            if user_data:
-                await websocket_manager.send_personal_message(f"You wrote: {user_data}", websocket)
-                await websocket_manager.broadcast(f"Client #{user_id} says: {user_data}")
+            entry = chat_stream.decode(await queue.get())
+            if entry["job"]:
+                # video 처리 결과 (done / failed)는 본인에게만 전달
+                await websocket_manager.send_personal_message(json.dumps(entry["job"]), websocket)
+                continue
+            user_data = entry["sentence"]
+            await websocket_manager.send_personal_message(f"You wrote: {user_data}", websocket)
+            await websocket_manager.broadcast(f"Client #{user_id} says: {user_data}")
+
+    try:
+        await _wait_first(
+            asyncio.create_task(_receive_until_disconnect(websocket)),
+            asyncio.create_task(_deliver()),
+        )
     except WebSocketDisconnect:
         pass
     finally:
-        websocket_manager.disconnect(websocket, user_id)
+        redis_subscriber.unsubscribe(user_id, queue)
+        await websocket_manager.disconnect(websocket, user_id)
         await websocket_manager.broadcast(f"Client #{user_id} left the chat")
 
 
+def _chat_event(entry: dict) -> str:
+    return json.dumps({"type": "message", "id": entry["id"], "sentence": entry["sentence"]})
+
 
 @chat_router.websocket("/ws/chat/realtime/{user_id}")
-async def websocket_endpoint(websocket: WebSocket, user_id: str):
-    await websocket_manager.connect(websocket, user_id)
-    
-    pubsub = None
-    client_disconnected = False
+async def realtime_websocket_endpoint(websocket: WebSocket, user_id: str, last_id: Optional[str] = None):
+    '''
+    ?last_id= 로 재연결하면 그 이후 메시지를 stream에서 먼저 받고 이어서 실시간 메시지를 받음
+    (catch-up 도중 publish 된 메시지를 놓치지 않도록 queue를 먼저 subscribe 하고, 이미 보낸 id는 건너뜀)
+    last_id 형식이 잘못되면 1008로 연결 종료
+    '''
     try:
-        pubsub = redisdb.pubsub()
-        await pubsub.subscribe(user_id)
+        delivered = parse_stream_id(last_id) if last_id else None
+    except ValueError:
+        await websocket.accept()
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="invalid last_id")
+        return
 
-        while True:
-            # Check for disconnected state early and handle it
-            if websocket.client_state == WebSocketState.DISCONNECTED:
-                client_disconnected = True
-                break
-
-            res = await pubsub.get_message(timeout=20)
-            if res is not None and res['type'] == 'message':
-                print(f"res: {res}")
-                # Gracefully send the message
-                try:
-                    if websocket.client_state == WebSocketState.CONNECTED:
-                        await websocket_manager.send_personal_message(f"You wrote: {res['data']}", websocket)
-                except WebSocketDisconnect:
-                    client_disconnected = True
+    await websocket_manager.connect(websocket, user_id)
+    queue = redis_subscriber.subscribe(user_id)
+
+    async def _deliver():
+        nonlocal delivered
+        if last_id:
+            while True:
+                entries = await chat_stream.read(user_id, last_id=f"{delivered[0]}-{delivered[1]}")
+                for entry in entries:
+                    await websocket_manager.send_personal_message(_chat_event(entry), websocket)
+                    delivered = parse_stream_id(entry["id"])
+                if len(entries) < chat_stream.batch_size:
                     break
 
-            await asyncio.sleep(3)
-            
+        while True:
+            entry = chat_stream.decode(await queue.get())
+            if entry["job"]:
+                await websocket_manager.send_personal_message(json.dumps(entry["job"]), websocket)
+                continue
+            if entry["id"]:
+                entry_id = parse_stream_id(entry["id"])
+                if delivered and entry_id <= delivered:
+                    continue
+                delivered = entry_id
+            await websocket_manager.send_personal_message(_chat_event(entry), websocket)
+
+    try:
+        await _wait_first(
+            asyncio.create_task(_receive_until_disconnect(websocket)),
+            asyncio.create_task(_deliver()),
+        )
     except WebSocketDisconnect:
-        client_disconnected = True
+        pass
     finally:
-        # Clean up and broadcast
-        if client_disconnected:
-            websocket_manager.disconnect(websocket, user_id)
-            await websocket_manager.broadcast(f"Client {user_id} left the chat room")
-        # Clean up Redis subscription
-        if pubsub:
-            await pubsub.close()
+        redis_subscriber.unsubscribe(user_id, queue)
+        await websocket_manager.disconnect(websocket, user_id)
+        await websocket_manager.broadcast(f"Client {user_id} left the chat room")
+
+
+@chat_router.get("/stats/websocket")
+async def get_websocket_stats():
+    '''
+    현재 worker의 websocket 송신 queue / 연결 해제 통계
+    '''
+    return {
+        "connections": websocket_manager.stats(),
+        "subscriber": redis_subscriber.stats(),
+    }
+
+
+@chat_router.get("/stats/chat-writes")
+async def get_chat_write_stats():
+    '''
+    현재 worker의 채팅 write-behind buffer 통계 (flush 횟수 / 평균 batch 크기 / 유실 수)
+    '''
+    return chat_write_buffer.stats()
 
 
 @chat_router.post("/chat/{user_id}/")
 async def send_message(user_id: str, sentence: str):
-    # Redis에 메시지 저장 (임시 캐싱)
-    await redisdb.set(user_id, sentence)
-
-    # MongoDB에 메시지 저장
+    # MongoDB 저장은 write-behind buffer가 모아서 insert_many
+    # (CHAT_WRITE_DURABILITY=sync 이면 flush 될 때까지 대기)
     chat_data = {
         "user_id": user_id,
         "sentence": sentence
     }
     chat_data_instance = UserChatModel(**chat_data)
 
-    await chat_database.save(document=chat_data_instance)
+    try:
+        await chat_write_buffer.add(chat_data_instance)
+    except WriteBehindFull:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Chat write buffer is full, retry later")
 
-    # Publish the message to the Redis channel
-    await redisdb.publish(f"chat_{user_id}", sentence)
+    # 사용자 stream에 추가 + chat_{user_id} 채널로 publish
+    message_id = await chat_stream.append(user_id, sentence)
 
-    return {"message": "Message sent successfully"}
+    return {"message": "Message sent successfully", "id": message_id}
 
 
 @chat_router.get("/chat/{user_id}/")
-async def get_message(user_id: str):
-    # Redis에서 메시지 확인
-    sentence = await redisdb.get(user_id)
-    if sentence:
-        logger.info("get message from redis")
-        redisdb.delete(user_id)
-        logger.info(f"delete {user_id} message from redis")
-        return {"user_id": user_id, "sentence": sentence}
-    
-    # MongoDB에서 메시지 가져오기
-    chat_data = await chat_database.get({"user_id": user_id})
+async def get_message(user_id: str, last_id: Optional[str] = None, count: Optional[int] = None):
+    '''
+    last_id 이후의 메시지를 오래된 순서로 반환 (last_id가 없으면 최근 메시지)
+    다음 요청에는 응답의 last_id를 넘겨서 이어 읽음
+    '''
+    try:
+        messages = await chat_stream.read(user_id, last_id=last_id, count=count)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if messages or last_id:
+        logger.info("get message from redis stream")
+        return {
+            "user_id": user_id,
+            "messages": messages,
+            "last_id": messages[-1]["id"] if messages else last_id,
+        }
+
+    # stream이 비어 있으면 (만료 / trim) MongoDB에서 가장 최근 메시지를 같은 형식으로 반환
+    # MongoDB 문서에는 stream id가 없으므로 id / last_id는 None (다음 요청은 last_id 없이)
+    chat_data = await chat_database.get_latest({"user_id": user_id})
     if not chat_data:
         raise HTTPException(status_code=404, detail="Message not found")
-    
-    return chat_data.dict()
+
+    logger.info("get message from mongodb")
+    return {
+        "user_id": user_id,
+        "messages": [{"id": None, "sentence": chat_data.sentence}],
+        "last_id": None,
+    }
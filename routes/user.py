@@ -1,8 +1,6 @@
 from datetime import datetime, timedelta
 from typing import Optional
 
-import bcrypt
-
 from fastapi import Depends, HTTPException, APIRouter, status
 from fastapi.security import (
     HTTPBearer,
@@ -10,7 +8,10 @@ from fastapi.security import (
     OAuth2PasswordRequestForm,
 )
 from config.redis import redisdb
-from utils.credential import get_access_token
+from config.redis_keys import redis_keys
+from utils.credential import get_access_token, get_current_user, ALGORITHM, SECRET_KEY
+from config.token_cache import token_cache
+from utils.password import password_hasher, PasswordHasherBusy
 
 from jose import jwt
 from jose.exceptions import ExpiredSignatureError
@@ -18,6 +19,7 @@ from jose.exceptions import ExpiredSignatureError
 from beanie import init_beanie
 from beanie.odm.documents import Document
 from beanie.odm.fields import PydanticObjectId
+from pymongo.errors import DuplicateKeyError
 
 from models.user import User, UserIn, CreateOTPRequest, VerifyOTPRequest
 import os
@@ -26,8 +28,6 @@ import uuid
 
 user_router = APIRouter()
 
-ALGORITHM = "HS256"
-SECRET_KEY = os.getenv("JWT_SECRET_KEY")
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 
@@ -38,53 +38,50 @@ def create_otp() -> int:
     return random.randint(1000, 9999)
 
 
-async def get_current_user(
-        authorization: HTTPAuthorizationCredentials = Depends(
-            HTTPBearer(auto_error=False)
-        )
-) -> User:
-    token = authorization.credentials # access_token
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
-        user = await User.find_one(User.username == payload.get("sub"))
-        # print(user)
-        if not user:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid username or password")
-        return user
-    except ExpiredSignatureError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has expired")
-    except Exception as e:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials")
-
-
 @user_router.post("/register/")
 async def register(user_in: UserIn) -> dict[str, str]:
+    # 미리 확인해서 bcrypt 계산을 아끼고, 동시 요청은 username unique index가 막음
     user = await User.find_one(User.username == user_in.username)
     if user:
         raise HTTPException(status_code=400, detail="Username already registered")
 
-    hashed_password = bcrypt.hashpw(user_in.password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    try:
+        hashed_password = await password_hasher.hash(user_in.password)
+    except PasswordHasherBusy:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Too many requests, retry later")
     user = User(username=user_in.username,
                 hashed_password=hashed_password,
                 password=user_in.password)
-    await user.insert()
+    try:
+        await user.insert()
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Username already registered")
     return {"msg": "User created successfully."}
 
 
 @user_router.post("/login/")
 async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     user = await User.find_one(User.username == form_data.username)
-    if not user or not bcrypt.checkpw(form_data.password.encode('utf-8'), user.hashed_password.encode('utf-8')):
+    try:
+        verified = bool(user) and await password_hasher.verify(form_data.password, user.hashed_password)
+        if verified and password_hasher.needs_rehash(user.hashed_password):
+            # BCRYPT_ROUNDS가 바뀌었으면 로그인 시 새 cost로 다시 저장
+            await user.set({User.hashed_password: await password_hasher.hash(form_data.password)})
+            password_hasher.rehashed += 1
+    except PasswordHasherBusy:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Too many requests, retry later")
+    if not verified:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid username or password")
 
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     token_data = {"sub": user.username, "exp": expire}
-    token = jwt.encode(token_data, SECRET_KEY, algorithm="HS256")
+    token = jwt.encode(token_data, SECRET_KEY, algorithm=ALGORITHM)
 
     refresh_token_created = create_refresh_token()
-    await redisdb.set(refresh_token_created, form_data.username)
-    await redisdb.expire(refresh_token_created, 7 * 24 * 60 * 60)
-    # 7 days expiration for the refresh token
+    # 7 days expiration for the refresh token (REFRESH_TOKEN_TTL)
+    await redisdb.set(
+        redis_keys.refresh_token.key(refresh_token_created), form_data.username, ex=redis_keys.refresh_token.ttl
+    )
 
     return {"access_token": token, "refresh_token": refresh_token_created}
 
@@ -92,12 +89,14 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
 @user_router.post("/logout/")
 async def logout(
         refresh_token: str,
+        access_token: str = Depends(get_access_token),
         current_user: User = Depends(get_current_user)
 ):
     '''
     로그아웃 로직. JWT 토큰 기반 시스템에서는 클라이언트의 토큰을 만료시키거나 삭제하는 방식으로 처리.
     '''
-    await redisdb.delete(refresh_token)
+    await redisdb.delete(redis_keys.refresh_token.key(refresh_token))
+    token_cache.invalidate(access_token)
 
     return {"msg": "Logout successful."}
 
@@ -106,7 +105,7 @@ async def logout(
 async def refresh_token(
         refresh_token: str
 ):
-    redis_user_name = await redisdb.get(refresh_token)
+    redis_user_name = await redisdb.get(redis_keys.refresh_token.key(refresh_token))
     print(redis_user_name)
 
     if not redis_user_name:
@@ -116,17 +115,36 @@ async def refresh_token(
     if not user:
         raise HTTPException(status_code=404, detail="User Not Found")
 
+    # 이전 access token으로 캐시된 사용자 정보는 다시 조회하도록 삭제
+    token_cache.invalidate_user(user.username)
+
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     token_data = {"sub": user.username, "exp": expire}
-    new_access_token = jwt.encode(token_data, SECRET_KEY, algorithm="HS256")
+    new_access_token = jwt.encode(token_data, SECRET_KEY, algorithm=ALGORITHM)
 
     return {"access_token": new_access_token}
 
 @user_router.get("/users/me", response_model=User)
-async def get_current_user(user: dict = Depends(get_current_user)):
+async def read_current_user(user: dict = Depends(get_current_user)):
     return user
 
 
+@user_router.get("/auth/cache/stats")
+async def get_token_cache_stats() -> dict:
+    '''
+    현재 worker의 검증된 token 캐시 hit ratio
+    '''
+    return token_cache.stats()
+
+
+@user_router.get("/auth/password/stats")
+async def get_password_hasher_stats() -> dict:
+    '''
+    현재 worker의 password hash thread pool 대기 / 거절 수
+    '''
+    return password_hasher.stats()
+
+
 # post otp
 @user_router.post("/email/otp")
 async def create_otp_handler(
@@ -135,8 +153,7 @@ async def create_otp_handler(
 ):
     otp: int = create_otp()
 
-    await redisdb.set(request.email, otp)
-    await redisdb.expire(request.email, 30 * 60)
+    await redisdb.set(redis_keys.otp.key(request.email), otp, ex=redis_keys.otp.ttl)
 
     # send otp to email
     return {"otp": otp}
@@ -145,9 +162,9 @@ async def create_otp_handler(
 async def verify_otp_handler(
     request: VerifyOTPRequest,
     # background_tasks: BackgroundTasks,
-    access_token: str = Depends(get_access_token),
+    user: User = Depends(get_current_user),
 ) -> dict[str, str]:
-    otp: str | None = await redisdb.get(request.email)
+    otp: str | None = await redisdb.get(redis_keys.otp.key(request.email))
     print('otp', otp)
 
     if not otp:
@@ -156,12 +173,6 @@ async def verify_otp_handler(
     if request.otp != int(otp):
         raise HTTPException(status_code=400, detail="Bad Request")
 
-    token_username: str = jwt.decode(access_token, SECRET_KEY, algorithms=["HS256"]).get("sub")
-
-    user: User | None = await User.find_one(User.username == token_username)
-    if not user:
-        raise HTTPException(status_code=404, detail="User Not Found")
-
     print(user.dict())
     # save email to user
 
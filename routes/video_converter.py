@@ -4,176 +4,482 @@ from config.websocket import websocket_manager
 
 try:
     # fastapi
-    from fastapi import APIRouter, Request, Depends, HTTPException, Query, Body, File, UploadFile
+    from fastapi import APIRouter, Request, Depends, HTTPException, Query, Body, File, UploadFile, Header
     from fastapi.responses import JSONResponse
-    from typing import Dict, Union, Optional
-    from utils.credential import get_access_token
+    from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Union, Optional, Tuple
+    from utils.credential import get_token_claims
 
-    # requests 관련
-    import requests
-    from requests.exceptions import RequestException
-    
     import os
 
     from models.video import VideoData, VideoDataModel, VideoDataUpdate, Database
     from config.redis import redisdb
+    from config.chat_stream import chat_stream
+    from config.s3 import s3client
+    from config.job_queue import video_job_queue, JobQueueFull
+    from pymongo.errors import DuplicateKeyError
+    from utils.transcoder import transcoder
+    from config.inference_cache import inference_cache
+    from utils.frame_extractor import frame_extractor
+    from config.inference import inference_engine
+    from config.micro_batcher import inference_batcher
 
     from typing import List
 
     # 3rd party library 관련
-    import boto3
-    from dotenv import load_dotenv
-
-    from jose import jwt
-    from jose.exceptions import ExpiredSignatureError
+    from config.settings import load_settings
     
     import logging
-    import subprocess
+    import asyncio
+    import hashlib
+    import uuid
 
     print("All Modules are loaded")
 
 except Exception as e:
     print("Error : {} ".format(e))
 
-load_dotenv()
+if TYPE_CHECKING:
+    # numpy / 모델은 서버 시작 시 import하지 않고 첫 inference 때 import
+    import numpy as np
+
+load_settings()
+
+S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME", "de-video-storage")
 
-AWS_ACCESS_KEY = os.getenv("AWS_ACCESS_KEY")
-AWS_SECRET_KEY = os.getenv("AWS_SECRET_KEY")
-SECRET_KEY = os.getenv("JWT_SECRET_KEY")
+# stream : UploadFile -> S3 multipart upload 직접 전송 (static 폴더에 저장하지 않음)
+# spool : static 폴더에 임시 저장 후 업로드 (ffmpeg 변환 등 로컬 파일이 필요한 경우)
+VIDEO_INGEST_MODE = os.getenv("VIDEO_INGEST_MODE", "stream")
+# spool 모드에서 S3 업로드 전에 mp4로 변환할지 여부
+VIDEO_TRANSCODE = os.getenv("VIDEO_TRANSCODE", "true").lower() == "true"
+# inference 전처리 파라미터 (inference cache key에 포함)
+INFERENCE_PREPROCESS_PARAMS: Dict[str, Any] = frame_extractor.params
+# S3 multipart upload의 최소 part 크기는 5MB (마지막 part 제외)
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+S3_PART_SIZE = max(int(os.getenv("S3_PART_SIZE", 8 * 1024 * 1024)), S3_MIN_PART_SIZE)
+# 동시에 업로드 중인 part 수 -> 요청 당 메모리는 S3_PART_SIZE * S3_MAX_CONCURRENCY 로 제한
+S3_MAX_CONCURRENCY = int(os.getenv("S3_MAX_CONCURRENCY", 4))
 
 converter_router = APIRouter()
 video_database = Database(VideoDataModel)
 
-def _upload_to_s3(file_path: str, bucket_name: str, object_name: str = None) -> str:
+async def _upload_to_s3(file_path: str, bucket_name: str, object_name: str = None) -> str:
     
     # If no object name is provided, default to the file's name
     if object_name is None:
         object_name = os.path.basename(file_path) # file's name 
     
-    # Create an S3 client
-    s3_client = boto3.client('s3',
-                             aws_access_key_id=AWS_ACCESS_KEY,
-                             aws_secret_access_key=AWS_SECRET_KEY)
-    
     try:    
         s3_save_path = os.path.join('video', object_name)
-        # Upload the file
-        s3_client.upload_file(file_path, bucket_name, s3_save_path)
-        
+        # Upload the file (공유 S3 client, event loop 밖에서 실행)
         # Return the URL where the uploaded object can be accessed
-        return f"https://{bucket_name}.s3.amazonaws.com/{s3_save_path}"
+        return await s3client.upload_file(file_path, bucket_name, s3_save_path)
     
     except Exception as e:
         print(f"An error occurred: {e}")
         raise e
 
 
-def _convert_mov_to_mp4(input_file: str, output_file: str):
-    command = ['ffmpeg', '-i', input_file, output_file]
-    subprocess.run(command)
+class ContentHashMismatch(ValueError):
+    pass
+
+
+async def _find_video_by_hash(content_hash: str, user_id: Optional[str] = None) -> Optional[VideoDataModel]:
+    '''
+    같은 내용(SHA-256)의 video가 이미 처리되었는지 조회 (content_hash_user index 사용)
+    user_id를 주면 그 사용자의 문서만 조회
+    '''
+    query = {"content_hash": content_hash}
+    if user_id is not None:
+        query["user_id"] = user_id
+    video_data = await video_database.get(query)
+    return video_data if video_data else None
+
+
+async def _save_video(user_id: str, s3_uri: str, sentence: str, content_hash: str) -> VideoDataModel:
+    '''
+    사용자의 video 문서 저장, 같은 사용자의 같은 content가 동시에 저장되면 (unique index) 먼저 저장된 문서 반환
+    '''
+    video_data = VideoDataModel(user_id=user_id, s3_uri=s3_uri, sentence=sentence, content_hash=content_hash)
+    try:
+        await video_database.save(video_data)
+    except DuplicateKeyError:
+        return await _find_video_by_hash(content_hash, user_id)
+    return video_data
+
+
+async def _reuse_video(content_hash: str, user_id: str) -> Optional[VideoDataModel]:
+    '''
+    이미 처리된 content면 S3 object와 inference 결과를 재사용해서 요청한 사용자의 문서를 반환
+    (다른 사용자의 문서를 그대로 돌려주지 않고 사용자 소유의 문서를 새로 저장)
+    '''
+    own = await _find_video_by_hash(content_hash, user_id)
+    if own:
+        return own
+    source = await _find_video_by_hash(content_hash)
+    if not source:
+        return None
+    return await _save_video(user_id, source.s3_uri, source.sentence, content_hash)
+
+
+async def _stream_upload_to_s3(file: UploadFile,
+                               bucket_name: str,
+                               object_name: str,
+                               expected_hash: Optional[str] = None) -> Tuple[Optional[str], str]:
+    '''
+    UploadFile을 S3_PART_SIZE 단위로 읽으면서 바로 S3 multipart upload로 전송
+    최대 S3_MAX_CONCURRENCY 개의 part를 동시에 업로드하고, 실패 시 multipart upload를 abort
+    전송하면서 SHA-256을 계산하고, complete 직전에 같은 hash의 video가 있으면 abort
+    -> (s3_uri, content_hash) 반환, 중복이면 s3_uri는 None
+    '''
+    s3_save_path = os.path.join('video', object_name)
+    hasher = hashlib.sha256()
+
+    first_chunk = await file.read(S3_PART_SIZE)
+    if not first_chunk:
+        raise ValueError("empty upload file")
+
+    upload_id = await s3client.create_multipart_upload(bucket_name, s3_save_path)
+
+    semaphore = asyncio.Semaphore(S3_MAX_CONCURRENCY)
+    tasks: List[asyncio.Task] = []
+
+    async def _upload_part(part_number: int, body: bytes) -> dict:
+        try:
+            return await s3client.upload_part(bucket_name, s3_save_path, upload_id, part_number, body)
+        finally:
+            semaphore.release()
+
+    try:
+        chunk = first_chunk
+        part_number = 1
+        while chunk:
+            await semaphore.acquire()
+            tasks.append(asyncio.create_task(_upload_part(part_number, chunk)))
+            part_number += 1
+            # hashlib은 GIL을 해제하므로 thread에서 계산
+            await asyncio.to_thread(hasher.update, chunk)
+            # 다음 part를 읽는 동안 이전 part들은 업로드 진행
+            chunk = await file.read(S3_PART_SIZE)
+
+        parts = await asyncio.gather(*tasks)
+        content_hash = hasher.hexdigest()
+
+        if expected_hash and expected_hash != content_hash:
+            raise ContentHashMismatch(f"content hash mismatch: expected {expected_hash}, got {content_hash}")
+
+        if await _find_video_by_hash(content_hash):
+            # 이미 처리된 video -> 객체를 만들지 않고 업로드 취소
+            await s3client.abort_multipart_upload(bucket_name, s3_save_path, upload_id)
+            return None, content_hash
+
+        s3_uri = await s3client.complete_multipart_upload(bucket_name, s3_save_path, upload_id, parts)
+        return s3_uri, content_hash
+
+    except BaseException as e:
+        print(f"An error occurred during multipart upload: {e}")
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        try:
+            await s3client.abort_multipart_upload(bucket_name, s3_save_path, upload_id)
+        except Exception as abort_error:
+            print(f"An error occurred during multipart upload abort: {abort_error}")
+        raise
+
+
+async def _spool_upload_file(file: UploadFile) -> Tuple[str, str]:
+    '''
+    UploadFile을 static 폴더에 고정 크기 chunk 단위로 저장하고 (파일 경로, SHA-256)을 반환
+    '''
+    from tempfile import NamedTemporaryFile
+
+    hasher = hashlib.sha256()
+    suffix = os.path.splitext(file.filename or "")[1] or '.mov'
+    with NamedTemporaryFile(mode='w+b', suffix=suffix, dir='static', delete=False) as temp_file:
+        try:
+            while chunk := await file.read(S3_PART_SIZE):
+                temp_file.write(chunk)
+                await asyncio.to_thread(hasher.update, chunk)
+        except Exception:
+            temp_file.close()
+            os.remove(temp_file.name)
+            raise
+    return temp_file.name, hasher.hexdigest()
+
+
+async def _convert_mov_to_mp4(input_file: str, output_file: str, job_id: Optional[str] = None) -> str:
+    '''
+    ffmpeg 변환 stage (동시 실행 수 제한, timeout 시 kill)
+    job_id가 주어지면 변환 진행률을 job 상태에 기록
+    '''
+    last_reported = -1
+
+    async def _report_progress(progress: float):
+        nonlocal last_reported
+        percent = int(progress * 100)
+        # redis 쓰기를 줄이기 위해 5% 단위로만 기록
+        if job_id and (percent // 5 > last_reported // 5 or percent == 100):
+            last_reported = percent
+            await video_job_queue.set_status(job_id, stage="transcoding", progress=percent)
+
+    return await transcoder.transcode(input_file, output_file, progress_callback=_report_progress)
+
+
+async def _frame_source(s3_uri: str, file_path: Optional[str] = None) -> str:
+    '''
+    frame 추출에 사용할 입력 (로컬 파일이 있으면 로컬 파일, 없으면 S3 presigned URL)
+    '''
+    if file_path and os.path.exists(file_path):
+        return file_path
+    return await s3client.presigned_url(S3_BUCKET_NAME, s3client.key_of(s3_uri))
+
+
+async def _extract_frame_batches(source: str) -> AsyncIterator["np.ndarray"]:
+    '''
+    frame 추출 stage : ffmpeg rawvideo pipe -> (batch, height, width, 3) uint8 batch
+    영상 전체가 아닌 batch 단위로만 메모리에 올라감
+    '''
+    async for batch in frame_extractor.aiter_batches(source):
+        yield batch
+
+
+async def _run_inference(s3_uri: str, file_path: Optional[str] = None) -> str:
+    '''
+    frame batch를 순서대로 읽어 clip feature를 계산하고,
+    동시에 들어온 다른 업로드의 feature와 함께 micro batch로 inference
+    '''
+    from utils.sign_model import ClipFeatureAccumulator
+
+    source = await _frame_source(s3_uri, file_path)
+    accumulator = ClipFeatureAccumulator()
+    async for batch in _extract_frame_batches(source):
+        await asyncio.to_thread(accumulator.update, batch)
+    return await inference_batcher.submit(accumulator.features())
+
+
+async def run_inference_batch(features: List["np.ndarray"]) -> List[str]:
+    '''
+    inference micro batcher의 batch handler (batch 전체를 한 번의 벡터 연산으로 처리)
+    모델은 inference engine worker에 미리 load 되어 있음
+    '''
+    return await inference_engine.infer_batch(features)
+
+
+def _video_to_dict(video_data: VideoDataModel) -> Dict[str, Any]:
+    # ObjectId를 문자열로 변환
+    data_dict = video_data.dict()
+    data_dict["id"] = str(data_dict["id"])
+    return data_dict
+
+
+async def process_video_job(job_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    '''
+    video job queue worker에서 실행되는 처리 pipeline
+    (spool 모드) S3 업로드 -> inference -> db 저장 -> redis 저장 및 publish
+    '''
+    import time
+
+    inferred_username = payload["user_id"]
+    content_hash = payload["content_hash"]
+    s3_uri = payload.get("s3_uri")
+    mov_file_path = payload.get("file_path")
+    upload_file_path = mov_file_path
+    # job이 만든 임시 파일 (성공 / 실패와 관계없이 job 종료 시 삭제)
+    temp_files = [mov_file_path] if mov_file_path else []
+
+    try:
+        # 같은 video가 동시에 올라온 경우 먼저 끝난 job의 결과를 재사용
+        duplicate = await _reuse_video(content_hash, inferred_username)
+        if duplicate:
+            print(f"video job {job_id} is duplicate of {duplicate.id}")
+            if s3_uri and s3_uri != duplicate.s3_uri:
+                # stream 모드에서 임시 uuid key로 이미 올린 object는 필요 없음
+                await s3client.delete_object(S3_BUCKET_NAME, s3client.key_of(s3_uri))
+            return {
+                "s3_uri": duplicate.s3_uri,
+                "duplicate": True,
+                "data": _video_to_dict(duplicate)
+            }
+
+        if s3_uri is None:
+            # Convert .mov to .mp4
+            if VIDEO_TRANSCODE and not mov_file_path.endswith('.mp4'):
+                mp4_file_path = os.path.splitext(mov_file_path)[0] + '.mp4'
+                temp_files.append(mp4_file_path)
+                upload_file_path = await _convert_mov_to_mp4(mov_file_path, mp4_file_path, job_id)
+                print(f"video converted to mp4 : {upload_file_path}")
+
+            await video_job_queue.set_status(job_id, stage="uploading")
+            # S3 object key는 content hash 기준
+            object_name = f"{content_hash}{os.path.splitext(upload_file_path)[1]}"
+            s3_uri = await _upload_to_s3(upload_file_path, S3_BUCKET_NAME, object_name)
+            print(f"video uploaded to s3 : {s3_uri}")
+
+        # inference (content hash + model version + 전처리 파라미터 기준 캐시)
+        await video_job_queue.set_status(job_id, stage="inference")
+        inferred_data = await inference_cache.get_or_compute(
+            content_hash,
+            INFERENCE_PREPROCESS_PARAMS,
+            lambda: _run_inference(s3_uri, upload_file_path),
+        )
+
+        # save data to db
+        video_data = await _save_video(inferred_username, s3_uri, inferred_data, content_hash)
+        print(f'job {job_id} saved to db')
+
+        try:
+            # 처리 완료를 사용자 채팅 stream에 추가하고 채널로 push
+            message_id = await chat_stream.append(inferred_username, inferred_data)
+            print(f'appended to redis stream : {inferred_username} ({message_id})')
+        except Exception as e:
+            print(f"An error occurred during redis publish: {e}")
+
+        loading_time = time.time() - payload["received_at"]
+        print(f"video job {job_id} took {loading_time} seconds")
+
+        return {
+            "s3_uri": s3_uri,
+            "loading_time": loading_time,
+            "data": _video_to_dict(video_data)
+        }
+    finally:
+        _remove_files(temp_files)
+
+
+def _remove_files(paths: List[str]):
+    for path in paths:
+        if path and os.path.exists(path):
+            os.remove(path)
+
+
+def discard_video_job(job_id: str, payload: Dict[str, Any]):
+    '''
+    종료 시 처리하지 못하고 failed 처리되는 job의 spool 파일 삭제
+    '''
+    _remove_files([payload.get("file_path")])
+
+
+def _duplicate_response(video_data: VideoDataModel) -> JSONResponse:
+    response_content = {
+        "status": "duplicate",
+        "message": f"video already saved at {video_data.s3_uri}",
+        "s3_uri": video_data.s3_uri,
+        "data": _video_to_dict(video_data)
+    }
+    return JSONResponse(content=response_content, status_code=200)
 
 
 @converter_router.post("/save_upload_s3/", 
                        response_class=JSONResponse,
-                       status_code=201)
+                       status_code=202)
 async def store_file(
-    access_token: str = Depends(get_access_token),
+    claims: dict = Depends(get_token_claims),
     username: Optional[str] = Body(None),
-    file: UploadFile = File(...)
+    file: UploadFile = File(...),
+    content_sha256: Optional[str] = Header(None, alias="X-Content-SHA256")
     ) -> Dict[str, Union[str, bool]]:
     '''
     upload video save into aws s3 using boto3
+    VIDEO_INGEST_MODE=stream 이면 static 폴더를 거치지 않고 S3 multipart upload로 바로 전송
+    파일 수신 후 처리는 video job queue에 등록하고 job id를 바로 반환 (202 Accepted)
+    이미 처리된 video(같은 SHA-256)면 S3 업로드/처리 없이 기존 결과를 반환 (200)
+    X-Content-SHA256 header를 보내면 body를 읽기 전에 중복 여부를 확인 (본인이 이미 올린 video만)
+    다른 사용자가 올린 같은 video면 S3 object / inference 결과를 재사용해서 본인 문서를 새로 저장
+    X-Content-SHA256 header가 실제 내용과 다르면 400
     '''
-    from tempfile import NamedTemporaryFile
     import time
 
-    print(access_token)
     print(username if username else "username is None")
+    print(claims.get("sub"))
 
-    username_decoded = jwt.decode(access_token, SECRET_KEY, algorithms=["HS256"])
-    print(username_decoded.get("sub"))
-
-    inferred_username = username if username else username_decoded.get("sub")
+    inferred_username = username if username else claims.get("sub")
 
     start_time = time.time()
     logging.info('video save start')
     print('video save start')
+    if content_sha256:
+        content_sha256 = content_sha256.lower()
+        # header만으로는 내용을 가졌는지 알 수 없으므로 본인 문서만 확인
+        duplicate = await _find_video_by_hash(content_sha256, inferred_username)
+        if duplicate:
+            return _duplicate_response(duplicate)
+
     # mp4, mov
-    # Use NamedTemporaryFile inside the static directory
-    with NamedTemporaryFile(
-        mode='w+b', suffix='.mov', dir='static', delete=False) as temp_file:
-        mov_file_path = temp_file.name
-        print(mov_file_path)
-        logging.info(mov_file_path)
-        
-        try:
-            with open(mov_file_path, "wb") as outfile:
-                for chunk in file.file:
-                    outfile.write(chunk)
-                
+    payload = {"user_id": inferred_username, "received_at": start_time}
+    mov_file_path = None
+    try:
+        if VIDEO_INGEST_MODE == "stream":
+            suffix = os.path.splitext(file.filename or "")[1] or '.mov'
+            # hash를 미리 알면 hash로, 아니면 임시 uuid로 object key 지정
+            object_name = f"{content_sha256 or uuid.uuid4().hex}{suffix}"
+            s3_uri, content_hash = await _stream_upload_to_s3(file, S3_BUCKET_NAME, object_name, content_sha256)
+            if s3_uri is None:
+                return _duplicate_response(await _reuse_video(content_hash, inferred_username))
+            payload["s3_uri"] = s3_uri
+            print(f"video streamed to s3 : {s3_uri}")
+        else:
+            mov_file_path, content_hash = await _spool_upload_file(file)
+            if content_sha256 and content_sha256 != content_hash:
+                raise ContentHashMismatch(f"content hash mismatch: expected {content_sha256}, got {content_hash}")
+            duplicate = await _reuse_video(content_hash, inferred_username)
+            if duplicate:
+                os.remove(mov_file_path)
+                return _duplicate_response(duplicate)
+            payload["file_path"] = mov_file_path
             print(f"video saved at static folder : {mov_file_path}")
             logging.info(f"video saved at static folder : {mov_file_path}")
-            
-            # Convert .mov to .mp4
-            # mp4_file_path = file_path.replace('.mov', '.mp4')
-            # _convert_mov_to_mp4(file_path, mp4_file_path)
-            try:
-                s3_uri = _upload_to_s3(mov_file_path, 'de-video-storage')
-                # inference
-
-                # inferred_data = requests.post("http://localhost:8000/inference/")
-                inferred_data = "inference data hello"
-
-                end_time = time.time()
-                loading_time = end_time - start_time
-                
-                print(f"video store took {loading_time} seconds")
-
-                save_data = {
-                    "user_id": inferred_username,
-                    "s3_uri": s3_uri,
-                    "sentence": inferred_data
-                }
-                # save data to db
-                print(save_data)
-                video_data = VideoDataModel(**save_data)
-                print(video_data)
-                await video_database.save(video_data)
-
-                print('saved to db')
-                print(inferred_username)
-                await redisdb.set(inferred_username, inferred_data)
-                print(f'saved to redis : key :{inferred_username}')
-                
-                try:
-                    # redis_pubsub = redisdb.pubsub()
-                    await redisdb.publish(channel=inferred_username, message=inferred_data)
-                    print('published to redis')
-                except:
-                    pass
-                
-                # ObjectId를 문자열로 변환
-                data_dict = video_data.dict()
-                data_dict["id"] = str(data_dict["id"])
-
-                response_content = {
-                    "status": "success",
-                    "message": f"video saved at {s3_uri} and sentence saved at db",
-                    "s3_uri": s3_uri,
-                    "loading_time": loading_time,
-                    "data": data_dict
-                }
-                
-                return JSONResponse(content=response_content, status_code=201)
-            
-            except Exception as e: 
-                raise HTTPException(status_code=500, detail=f"Error during saving to s3: {e}")
 
-        except Exception as e:
-            # If there's an error, clean up the temporary files if they were created
-            if os.path.exists(mov_file_path):
-                os.remove(mov_file_path)
-            if os.path.exists(mov_file_path):
-                os.remove(mov_file_path)
-            raise HTTPException(status_code=500, detail=f"Error during saving to s3: {e}")
+        payload["content_hash"] = content_hash
+        job_id = await video_job_queue.enqueue(payload)
 
+    except JobQueueFull as e:
+        if mov_file_path and os.path.exists(mov_file_path):
+            os.remove(mov_file_path)
+        raise HTTPException(status_code=503, detail=f"video job queue is full: {e}")
+
+    except ContentHashMismatch as e:
+        if mov_file_path and os.path.exists(mov_file_path):
+            os.remove(mov_file_path)
+        raise HTTPException(status_code=400, detail=str(e))
+
+    except Exception as e:
+        # If there's an error, clean up the temporary files if they were created
+        if mov_file_path and os.path.exists(mov_file_path):
+            os.remove(mov_file_path)
+        raise HTTPException(status_code=500, detail=f"Error during saving to s3: {e}")
+
+    response_content = {
+        "status": "accepted",
+        "message": "video received and queued for processing",
+        "job_id": job_id,
+        "status_url": f"/v1/video/jobs/{job_id}",
+    }
+
+    return JSONResponse(content=response_content, status_code=202)
+
+
+@converter_router.get("/jobs/{job_id}", response_class=JSONResponse, status_code=200)
+async def get_video_job(job_id: str) -> Dict[str, Any]:
+    '''
+    video 처리 job 상태 및 결과 조회 (queued, running, done, failed)
+    '''
+    job_status = await video_job_queue.get_status(job_id)
+    if not job_status:
+        raise HTTPException(status_code=404, detail="video job을 찾을 수 없습니다")
+    return job_status
+
+
+@converter_router.get("/inference/cache/stats", response_class=JSONResponse, status_code=200)
+async def get_inference_cache_stats() -> Dict[str, Any]:
+    '''
+    inference 캐시 hit/miss 통계 (현재 worker 프로세스 기준)
+    '''
+    return inference_cache.stats()
+
+
+@converter_router.get("/inference/batcher/stats", response_class=JSONResponse, status_code=200)
+async def get_inference_batcher_stats() -> Dict[str, Any]:
+    '''
+    inference micro batcher 통계 (batch 크기, 대기 시간, queue 깊이) 및 inference engine 정보
+    '''
+    return {**inference_batcher.stats(), "engine": inference_engine.stats()}
@@ -3,6 +3,19 @@ from fastapi.security import (
     HTTPBearer,
     HTTPAuthorizationCredentials,
 )
+from jose import jwt
+from jose.exceptions import ExpiredSignatureError, JWTError
+
+from config.token_cache import token_cache
+from models.user import User
+
+from config.settings import load_settings
+import os
+
+load_settings()
+
+ALGORITHM = "HS256"
+SECRET_KEY = os.getenv("JWT_SECRET_KEY")
 
 
 def get_access_token(
@@ -13,3 +26,37 @@ def get_access_token(
     if auth_header is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not Authorized")
     return auth_header.credentials  # access_token
+
+
+async def get_token_claims(access_token: str = Depends(get_access_token)) -> dict:
+    '''
+    검증된 token claims (요청당 한 번만 실행, 이미 검증한 token이면 캐시에서 반환)
+    '''
+    claims = token_cache.get_claims(access_token)
+    if claims is not None:
+        return claims
+
+    try:
+        claims = jwt.decode(access_token, SECRET_KEY, algorithms=[ALGORITHM])
+    except ExpiredSignatureError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has expired")
+    except JWTError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials")
+
+    token_cache.set_claims(access_token, claims)
+    return claims
+
+
+async def get_current_user(
+        access_token: str = Depends(get_access_token),
+        claims: dict = Depends(get_token_claims),
+) -> User:
+    user = token_cache.get_user(access_token)
+    if user is not None:
+        return user
+
+    user = await User.find_one(User.username == claims.get("sub"))
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid username or password")
+    token_cache.set_user(access_token, user)
+    return user
@@ -0,0 +1,61 @@
+'''
+주요 조회 쿼리의 실행 계획(explain)을 확인해서 COLLSCAN이 있으면 실패하는 점검 도구
+사용법 : python -m utils.explain_indexes
+'''
+import sys
+from typing import Any, Iterator, List, Optional, Tuple
+
+from bson import ObjectId
+
+from config.pymongo import get_connection, DATABASE_NAME
+
+# (이름, collection, filter, sort)
+HOT_QUERIES: List[Tuple[str, str, dict, Optional[list]]] = [
+    ("login / register / token 확인", "user", {"username": "explain"}, None),
+    ("사용자 채팅 조회", "user_chat", {"user_id": "explain"}, None),
+    ("사용자 채팅 최신순", "user_chat", {"user_id": "explain"}, [("_id", -1)]),
+    ("사용자 영상 목록", "video", {"user_id": "explain", "_id": {"$gt": ObjectId()}}, [("_id", 1)]),
+    ("영상 목록 keyset", "video", {"_id": {"$gt": ObjectId()}}, [("_id", 1)]),
+    ("중복 업로드 확인", "video", {"content_hash": "explain"}, None),
+    ("inference 캐시 조회", "inference_cache", {"cache_key": "explain"}, None),
+]
+
+
+def _stages(plan: Any) -> Iterator[str]:
+    # winningPlan 아래 inputStage / inputStages / queryPlan 을 모두 따라가며 stage 이름 수집
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from _stages(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            yield from _stages(value)
+
+
+def explain_query(database, collection: str, query: dict, sort: Optional[list]) -> List[str]:
+    cursor = database[collection].find(query).limit(1)
+    if sort:
+        cursor = cursor.sort(sort)
+    return list(_stages(cursor.explain()["queryPlanner"]["winningPlan"]))
+
+
+def main() -> int:
+    database = get_connection()[DATABASE_NAME]
+    failed = 0
+    for name, collection, query, sort in HOT_QUERIES:
+        stages = explain_query(database, collection, query, sort)
+        status = "FAIL" if "COLLSCAN" in stages else "ok"
+        if status == "FAIL":
+            failed += 1
+        print(f"[{status}] {name} ({collection}) : {' <- '.join(stages)}")
+
+    if failed:
+        print(f"COLLSCAN 쿼리 {failed}개 발견")
+        return 1
+    print("모든 쿼리가 index를 사용합니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+from typing import IO, TYPE_CHECKING, AsyncIterator, Iterator, List, Optional, Tuple
+
+from config.settings import load_settings
+
+if TYPE_CHECKING:
+    # numpy는 서버 시작 시 import하지 않고 frame을 처음 읽을 때 import
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+load_settings()
+
+
+class FrameExtractionError(Exception):
+    pass
+
+
+def _optional_float(name: str) -> Optional[float]:
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
+class FrameExtractor:
+    '''
+    ffmpeg rawvideo pipe 출력을 읽어서 (batch, height, width, 3) uint8 NumPy batch를 생성
+    - 설정한 fps / 해상도로 변환 (비율 유지 + padding)
+    - keyframe_threshold가 있으면 직전 선택 frame과의 평균 픽셀 차이가 threshold 이상인 frame만 사용
+    - 영상 전체를 메모리에 올리지 않고 batch 단위로 yield
+    '''
+    _FRAME_FPS = float(os.getenv("FRAME_FPS", 10))
+    _FRAME_WIDTH = int(os.getenv("FRAME_WIDTH", 224))
+    _FRAME_HEIGHT = int(os.getenv("FRAME_HEIGHT", 224))
+    _FRAME_BATCH_SIZE = int(os.getenv("FRAME_BATCH_SIZE", 32))
+    _FRAME_KEYFRAME_THRESHOLD = _optional_float("FRAME_KEYFRAME_THRESHOLD")
+    # 영상 하나의 frame 추출 전체에 허용하는 시간 (초)
+    _FRAME_EXTRACT_TIMEOUT = float(os.getenv("FRAME_EXTRACT_TIMEOUT", 300))
+
+    def __init__(self,
+                 fps: Optional[float] = None,
+                 width: Optional[int] = None,
+                 height: Optional[int] = None,
+                 batch_size: Optional[int] = None,
+                 keyframe_threshold: Optional[float] = None,
+                 timeout: Optional[float] = None):
+        self.fps = fps or self._FRAME_FPS
+        self.width = width or self._FRAME_WIDTH
+        self.height = height or self._FRAME_HEIGHT
+        self.batch_size = batch_size or self._FRAME_BATCH_SIZE
+        self.keyframe_threshold = keyframe_threshold if keyframe_threshold is not None else self._FRAME_KEYFRAME_THRESHOLD
+        self.timeout = timeout or self._FRAME_EXTRACT_TIMEOUT
+
+    @property
+    def params(self) -> dict:
+        # 결과에 영향을 주는 전처리 파라미터 (batch_size 제외)
+        return {
+            "fps": self.fps,
+            "width": self.width,
+            "height": self.height,
+            "keyframe_threshold": self.keyframe_threshold,
+        }
+
+    def build_command(self, source: str) -> List[str]:
+        video_filter = (
+            f"fps={self.fps},"
+            f"scale={self.width}:{self.height}:force_original_aspect_ratio=decrease,"
+            f"pad={self.width}:{self.height}:(ow-iw)/2:(oh-ih)/2"
+        )
+        return [
+            'ffmpeg', '-hide_banner', '-nostats', '-loglevel', 'error',
+            '-i', source,
+            '-an',
+            '-vf', video_filter,
+            '-pix_fmt', 'rgb24',
+            '-f', 'rawvideo',
+            'pipe:1',
+        ]
+
+    @staticmethod
+    def _motion(frame: "np.ndarray", previous: "np.ndarray") -> float:
+        import numpy as np
+
+        # 1/4 해상도에서 평균 절대 차이 계산 (0 ~ 255)
+        current = frame[::4, ::4].astype(np.int16)
+        return float(np.abs(current - previous[::4, ::4].astype(np.int16)).mean())
+
+    def _new_batch(self) -> "np.ndarray":
+        import numpy as np
+
+        return np.empty((self.batch_size, self.height, self.width, 3), dtype=np.uint8)
+
+    def _spawn(self, source: str) -> Tuple[subprocess.Popen, IO[bytes]]:
+        # stderr를 pipe로 두면 stdout을 다 읽기 전에 pipe가 가득 차서 ffmpeg가 멈출 수 있으므로 임시 파일에 기록
+        stderr = tempfile.TemporaryFile()
+        try:
+            process = subprocess.Popen(
+                self.build_command(source),
+                stdout=subprocess.PIPE,
+                stderr=stderr,
+            )
+        except BaseException:
+            stderr.close()
+            raise
+        return process, stderr
+
+    def iter_batches(self, source: str) -> Iterator["np.ndarray"]:
+        '''
+        source (로컬 경로 또는 URL)를 decode해서 frame batch를 순서대로 yield
+        마지막 batch는 batch_size보다 작을 수 있음
+        '''
+        process, stderr = self._spawn(source)
+        yield from self._read_batches(process, stderr)
+
+    def _read_batches(self, process: subprocess.Popen, stderr: IO[bytes]) -> Iterator["np.ndarray"]:
+        '''
+        ffmpeg stdout을 batch 단위로 읽음
+        FRAME_EXTRACT_TIMEOUT이 지나면 ffmpeg를 kill하고, 0이 아닌 exit code는 모두 FrameExtractionError
+        '''
+        timed_out = threading.Event()
+
+        def on_timeout():
+            timed_out.set()
+            process.kill()
+
+        timer = threading.Timer(self.timeout, on_timeout)
+        timer.daemon = True
+        timer.start()
+
+        batch = self._new_batch()
+        count = 0
+        previous: Optional["np.ndarray"] = None
+
+        try:
+            while True:
+                # batch 버퍼에 바로 읽어서 frame 단위 복사를 피함
+                slot = batch[count]
+                if process.stdout.readinto(memoryview(slot).cast('B')) < slot.nbytes:
+                    break
+
+                if self.keyframe_threshold is not None and previous is not None:
+                    if self._motion(slot, previous) < self.keyframe_threshold:
+                        continue
+                previous = slot.copy() if self.keyframe_threshold is not None else None
+
+                count += 1
+                if count == self.batch_size:
+                    yield batch
+                    batch = self._new_batch()
+                    count = 0
+
+            # 일부만 decode된 결과가 cache에 남지 않도록 exit code를 먼저 확인하고 마지막 batch를 yield
+            if process.wait() != 0:
+                if timed_out.is_set():
+                    raise FrameExtractionError(f"ffmpeg timed out after {self.timeout} seconds")
+                stderr.seek(0)
+                message = stderr.read().decode(errors='ignore').strip()
+                raise FrameExtractionError(f"ffmpeg exited with {process.returncode}: {message}")
+
+            if count:
+                yield batch[:count]
+        finally:
+            # generator를 중간에 닫는 경우에도 ffmpeg 프로세스 정리
+            timer.cancel()
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+            process.stdout.close()
+            stderr.close()
+
+    async def aiter_batches(self, source: str) -> AsyncIterator["np.ndarray"]:
+        '''
+        _read_batches를 thread에서 실행하는 async 버전 (event loop를 막지 않음)
+        취소되면 ffmpeg를 kill해서 thread의 read를 끝낸 뒤 generator를 닫고 CancelledError를 그대로 전달
+        '''
+        process, stderr = self._spawn(source)
+        batches = self._read_batches(process, stderr)
+        pending: Optional[asyncio.Future] = None
+        try:
+            while True:
+                # 취소되어도 thread의 next()는 멈추지 않으므로 future를 잡아 두고 shield로 기다림
+                pending = asyncio.ensure_future(asyncio.to_thread(next, batches, None))
+                batch = await asyncio.shield(pending)
+                pending = None
+                if batch is None:
+                    break
+                yield batch
+        finally:
+            if process.poll() is None:
+                process.kill()
+            if pending is not None:
+                # kill 후에는 readinto가 바로 끝나므로 진행 중인 next()가 돌아올 때까지 기다림
+                await asyncio.wait([pending])
+                if not pending.cancelled():
+                    pending.exception()
+            batches.close()
+
+# frame 추출 stage 싱글톤 패턴
+frame_extractor = FrameExtractor()
@@ -0,0 +1,106 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+import bcrypt
+from config.settings import load_settings
+import os
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+load_settings()
+
+T = TypeVar("T")
+
+
+class PasswordHasherBusy(Exception):
+    pass
+
+
+class PasswordHasher:
+    '''
+    bcrypt hash / 검증을 event loop 밖의 크기가 제한된 thread pool에서 실행
+    (bcrypt는 계산 중 GIL을 놓으므로 thread로 충분)
+    대기 중인 작업이 PASSWORD_HASH_MAX_PENDING을 넘으면 PasswordHasherBusy -> 503
+    '''
+    _CPU_COUNT = os.cpu_count() or 1
+    _BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+    _HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", max(1, min(4, _CPU_COUNT // 2))))
+    _MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", _HASH_WORKERS * 8))
+
+    def __init__(self):
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.pending = 0
+
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.total_seconds = 0.0
+
+    @property
+    def rounds(self) -> int:
+        return self._BCRYPT_ROUNDS
+
+    async def start(self):
+        self.executor = ThreadPoolExecutor(max_workers=self._HASH_WORKERS, thread_name_prefix="password-hash")
+        logger.info(f"password hasher 시작 (rounds={self._BCRYPT_ROUNDS}, workers={self._HASH_WORKERS})")
+
+    async def close(self):
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+            logger.info("password hasher 종료.")
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        if self.executor is None:
+            await self.start()
+        if self.pending >= self._MAX_PENDING:
+            self.rejected += 1
+            raise PasswordHasherBusy(f"password hash queue is full ({self.pending} pending)")
+
+        self.pending += 1
+        started_at = time.monotonic()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+            self.total_seconds += time.monotonic() - started_at
+
+    @staticmethod
+    def _hash(password: str, rounds: int) -> str:
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=rounds)).decode('utf-8')
+
+    @staticmethod
+    def _verify(password: str, hashed_password: str) -> bool:
+        return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self._hash, password, self._BCRYPT_ROUNDS)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(self._verify, password, hashed_password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        # "$2b$12$..." -> 저장된 cost(12)가 현재 설정과 다르면 다시 hash
+        try:
+            return int(hashed_password.split("$")[2]) != self._BCRYPT_ROUNDS
+        except (IndexError, ValueError):
+            return True
+
+    def stats(self) -> dict:
+        return {
+            "rounds": self._BCRYPT_ROUNDS,
+            "workers": self._HASH_WORKERS,
+            "max_pending": self._MAX_PENDING,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed,
+            "avg_ms": self.total_seconds * 1000 / self.completed if self.completed else 0.0,
+        }
+
+# password hasher 싱글톤 패턴
+password_hasher = PasswordHasher()
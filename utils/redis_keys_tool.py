@@ -0,0 +1,156 @@
+'''
+redis key schema 점검 / 마이그레이션 도구 (config/redis_keys 기준)
+사용법 :
+    python -m utils.redis_keys_tool report             # namespace 별 key 수 / 메모리 / TTL 없는 key 수
+    python -m utils.redis_keys_tool migrate            # 변경 예정 작업만 출력 (dry run)
+    python -m utils.redis_keys_tool migrate --apply    # 실제 적용
+
+마이그레이션 대상
+- schema의 key인데 TTL이 없음 -> family TTL 설정
+- video_job 상태가 JSON string -> hash로 변환
+- prefix 없는 이전 key
+    uuid 형식       -> refresh_token:{key}
+    email 형식      -> otp:{key}
+    그 외 string    -> 사용자별 마지막 문장 (채팅 / inference 결과, mongo에 보관됨) -> 삭제
+'''
+import argparse
+import asyncio
+import json
+import re
+import sys
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from config.redis import redisdb
+from config.redis_keys import redis_keys
+
+LEGACY_NAMESPACE = "(no prefix)"
+_UUID = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$")
+_SCAN_COUNT = 1000
+
+
+def _memory(result) -> int:
+    return result if isinstance(result, int) else 0
+
+
+async def _scan_batches():
+    cursor = 0
+    while True:
+        cursor, keys = await redisdb.client.scan(cursor=cursor, count=_SCAN_COUNT)
+        if keys:
+            # key 마다 TYPE / TTL / MEMORY USAGE를 한 번의 왕복으로 조회
+            async with redisdb.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.type(key)
+                    pipe.ttl(key)
+                    pipe.memory_usage(key)
+                # MEMORY 명령을 막아 둔 managed redis에서는 메모리를 0으로 집계
+                results = await pipe.execute(raise_on_error=False)
+            yield [
+                (key, results[i * 3], results[i * 3 + 1], _memory(results[i * 3 + 2]))
+                for i, key in enumerate(keys)
+            ]
+        if cursor == 0:
+            return
+
+
+def plan_action(key: str, data_type: str, ttl: int) -> Optional[Tuple[str, ...]]:
+    family = redis_keys.family_of(key)
+    if family is not None:
+        if family.data_type == "hash" and data_type == "string":
+            return ("to_hash", key, str(family.ttl))
+        if ttl == -1:
+            return ("expire", key, str(family.ttl))
+        return None
+
+    if data_type != "string":
+        return ("unclassified", key)
+    if _UUID.match(key):
+        return ("rename", key, redis_keys.refresh_token.key(key), str(redis_keys.refresh_token.ttl))
+    if "@" in key:
+        return ("rename", key, redis_keys.otp.key(key), str(redis_keys.otp.ttl))
+    return ("delete", key)
+
+
+async def apply_action(action: Tuple[str, ...]):
+    kind, key = action[0], action[1]
+    if kind == "expire":
+        await redisdb.client.expire(key, int(action[2]))
+    elif kind == "delete":
+        await redisdb.delete(key)
+    elif kind == "rename":
+        target, ttl = action[2], int(action[3])
+        # 이미 새 key가 있으면 덮어쓰지 않음 (RENAME은 기존 TTL을 유지)
+        if await redisdb.client.renamenx(key, target):
+            if await redisdb.client.ttl(target) == -1:
+                await redisdb.client.expire(target, ttl)
+    elif kind == "to_hash":
+        raw = await redisdb.get(key)
+        fields = {field: json.dumps(value) for field, value in json.loads(raw).items()}
+        ttl = await redisdb.client.ttl(key)
+        async with redisdb.pipeline() as pipe:
+            pipe.delete(key)
+            pipe.hset(key, mapping=fields)
+            pipe.expire(key, ttl if ttl > 0 else int(action[2]))
+
+
+async def report():
+    namespaces: Dict[str, Dict[str, int]] = defaultdict(lambda: {"keys": 0, "bytes": 0, "no_ttl": 0})
+    async for batch in _scan_batches():
+        for key, _, ttl, memory in batch:
+            family = redis_keys.family_of(key)
+            stats = namespaces[family.prefix if family else LEGACY_NAMESPACE]
+            stats["keys"] += 1
+            stats["bytes"] += memory
+            stats["no_ttl"] += ttl == -1
+
+    total = sum(stats["bytes"] for stats in namespaces.values()) or 1
+    print(f"{'namespace':<20}{'keys':>10}{'memory(KB)':>14}{'share':>8}{'no TTL':>10}")
+    for name, stats in sorted(namespaces.items(), key=lambda item: -item[1]["bytes"]):
+        print(
+            f"{name:<20}{stats['keys']:>10}{stats['bytes'] / 1024:>14.1f}"
+            f"{stats['bytes'] * 100 / total:>7.1f}%{stats['no_ttl']:>10}"
+        )
+
+
+async def migrate(apply: bool) -> int:
+    counts: Dict[str, int] = defaultdict(int)
+    unclassified: List[str] = []
+    async for batch in _scan_batches():
+        for key, data_type, ttl, _ in batch:
+            action = plan_action(key, data_type, ttl)
+            if action is None:
+                continue
+            counts[action[0]] += 1
+            if action[0] == "unclassified":
+                unclassified.append(f"{key} ({data_type})")
+                continue
+            if apply:
+                await apply_action(action)
+            else:
+                print(" ".join(action))
+
+    print(("적용" if apply else "예정") + " : " + ", ".join(f"{kind}={count}" for kind, count in sorted(counts.items())))
+    for key in unclassified[:20]:
+        print(f"분류되지 않은 key : {key}")
+    return 0
+
+
+async def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m utils.redis_keys_tool")
+    parser.add_argument("command", choices=["report", "migrate"])
+    parser.add_argument("--apply", action="store_true", help="migrate 작업을 실제로 적용")
+    args = parser.parse_args(argv)
+
+    await redisdb.connect()
+    try:
+        if args.command == "report":
+            await report()
+            return 0
+        return await migrate(args.apply)
+    finally:
+        await redisdb.close()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1:])))
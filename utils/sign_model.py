@@ -0,0 +1,78 @@
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+'''
+수어 인식 모델 자리를 대신하는 CPU stand-in 모델
+frame batch -> clip feature (격자 평균 색상 + 움직임 크기) -> 선형 분류 (batch 단위 벡터 연산)
+'''
+
+FEATURE_GRID = 8
+FEATURE_DIM = FEATURE_GRID * FEATURE_GRID * 3 + 1
+
+SIGN_VOCABULARY = [
+    "안녕하세요",
+    "감사합니다",
+    "죄송합니다",
+    "괜찮아요",
+    "도와주세요",
+    "네",
+    "아니요",
+    "사랑합니다",
+]
+
+
+class ClipFeatureAccumulator:
+    '''
+    frame batch를 순서대로 받아서 clip 하나의 feature vector를 누적 계산
+    frame 전체를 보관하지 않으므로 메모리는 batch 크기에만 비례
+    '''
+    def __init__(self, grid: int = FEATURE_GRID):
+        self.grid = grid
+        self.pooled_sum: Optional[np.ndarray] = None
+        self.motion_sum = 0.0
+        self.count = 0
+        self.previous: Optional[np.ndarray] = None
+
+    def _pool(self, batch: np.ndarray) -> np.ndarray:
+        # (n, h, w, 3) -> (n, grid, grid, 3) 격자 평균
+        n, height, width, channels = batch.shape
+        cell_h, cell_w = height // self.grid, width // self.grid
+        cropped = batch[:, :cell_h * self.grid, :cell_w * self.grid].astype(np.float32)
+        return cropped.reshape(n, self.grid, cell_h, self.grid, cell_w, channels).mean(axis=(2, 4))
+
+    def update(self, batch: np.ndarray):
+        if len(batch) == 0:
+            return
+        pooled = self._pool(batch)
+        sequence = pooled if self.previous is None else np.concatenate([self.previous[None], pooled])
+
+        self.pooled_sum = pooled.sum(axis=0) if self.pooled_sum is None else self.pooled_sum + pooled.sum(axis=0)
+        self.motion_sum += float(np.abs(np.diff(sequence, axis=0)).mean(axis=(1, 2, 3)).sum())
+        self.count += len(batch)
+        self.previous = pooled[-1]
+
+    def features(self) -> np.ndarray:
+        if self.count == 0:
+            return np.zeros(FEATURE_DIM, dtype=np.float32)
+        mean_color = (self.pooled_sum / self.count / 255.0).ravel()
+        motion = np.array([self.motion_sum / self.count / 255.0])
+        return np.concatenate([mean_color, motion]).astype(np.float32)
+
+
+class StandInSignModel:
+    '''
+    고정 seed 랜덤 가중치의 선형 분류기 (실제 모델 학습 전 테스트 용도)
+    '''
+    version = "stand-in-v1"
+
+    def __init__(self, vocabulary: Sequence[str] = SIGN_VOCABULARY, seed: int = 0):
+        self.vocabulary = list(vocabulary)
+        rng = np.random.default_rng(seed)
+        self.weights = rng.standard_normal((FEATURE_DIM, len(self.vocabulary))).astype(np.float32)
+        self.bias = rng.standard_normal(len(self.vocabulary)).astype(np.float32)
+
+    def predict_batch(self, features: Sequence[np.ndarray]) -> List[str]:
+        # (batch, FEATURE_DIM) @ (FEATURE_DIM, vocab) 한 번의 행렬 곱으로 batch 전체 처리
+        logits = np.stack(features) @ self.weights + self.bias
+        return [self.vocabulary[index] for index in logits.argmax(axis=1)]
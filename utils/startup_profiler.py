@@ -0,0 +1,153 @@
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from config.settings import load_settings
+import os
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+load_settings()
+
+
+class _TimedLoader:
+    '''
+    원래 loader의 exec_module 시간을 재는 wrapper
+    실행이 끝나면 module의 loader를 원래 loader로 되돌림
+    '''
+
+    def __init__(self, loader, profiler: "StartupProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        spec = module.__spec__
+        spec.loader = self._loader
+        module.__loader__ = self._loader
+        self._profiler._enter_import()
+        started_at = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit_import(module.__name__, time.perf_counter() - started_at)
+
+
+class _ImportTimer:
+    '''
+    sys.meta_path 맨 앞에 들어가서 나머지 finder가 찾은 spec의 loader만 감싸는 finder
+    '''
+
+    def __init__(self, profiler: "StartupProfiler"):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self._profiler)
+        return spec
+
+
+class StartupProfiler:
+    '''
+    서버 시작 시 module import 시간과 connection 별 connect 시간을 측정
+    - import : module 별로 하위 import를 뺀 자기 시간(self), 긴 순서로 STARTUP_PROFILE_TOP개 (0이면 전체)
+    - connect : measure()로 감싼 startup 단계별 시간
+    전체 시간이 STARTUP_BUDGET_SECONDS를 넘으면 warning
+    '''
+    _ENABLED = os.getenv("STARTUP_PROFILE", "true").lower() == "true"
+    _BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", 5))
+    _REPORT_TOP = int(os.getenv("STARTUP_PROFILE_TOP", 10))
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.imports_seconds = 0.0
+        self.boot_seconds: Optional[float] = None
+        self.import_self_seconds: Dict[str, float] = {}
+        self.connect_seconds: Dict[str, float] = {}
+
+        self._finder: Optional[_ImportTimer] = None
+        self._child_seconds: List[float] = []
+
+    def start_imports(self):
+        if not self._ENABLED or self._finder is not None:
+            return
+        self.started_at = time.perf_counter()
+        self._finder = _ImportTimer(self)
+        sys.meta_path.insert(0, self._finder)
+
+    def stop_imports(self):
+        if self._finder is None:
+            return
+        sys.meta_path.remove(self._finder)
+        self._finder = None
+        self.imports_seconds = time.perf_counter() - self.started_at
+
+    def _enter_import(self):
+        self._child_seconds.append(0.0)
+
+    def _exit_import(self, name: str, elapsed: float):
+        child_seconds = self._child_seconds.pop()
+        self.import_self_seconds[name] = elapsed - child_seconds
+        if self._child_seconds:
+            self._child_seconds[-1] += elapsed
+
+    def top_imports(self) -> List[Tuple[str, float]]:
+        imports = sorted(self.import_self_seconds.items(), key=lambda item: item[1], reverse=True)
+        return imports[:self._REPORT_TOP] if self._REPORT_TOP > 0 else imports
+
+    @contextmanager
+    def measure(self, name: str):
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.connect_seconds[name] = time.perf_counter() - started_at
+
+    def report(self):
+        self.boot_seconds = time.perf_counter() - self.started_at
+        if not self._ENABLED:
+            return
+
+        for name, seconds in self.top_imports():
+            logger.info(f"startup import  {name:<40} {seconds * 1000:8.1f} ms")
+        for name, seconds in self.connect_seconds.items():
+            logger.info(f"startup connect {name:<40} {seconds * 1000:8.1f} ms")
+
+        connect_seconds = sum(self.connect_seconds.values())
+        message = (
+            f"서버 시작 {self.boot_seconds:.2f}s "
+            f"(import {self.imports_seconds:.2f}s, connect {connect_seconds:.2f}s, budget {self._BUDGET_SECONDS:.2f}s)"
+        )
+        if self.boot_seconds > self._BUDGET_SECONDS:
+            logger.warning(f"{message} -> budget 초과")
+        else:
+            logger.info(message)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self._ENABLED,
+            "budget_seconds": self._BUDGET_SECONDS,
+            "boot_seconds": self.boot_seconds,
+            "imports_seconds": self.imports_seconds,
+            "modules": len(self.import_self_seconds),
+            "imports_ms": {name: round(seconds * 1000, 1) for name, seconds in self.top_imports()},
+            "connect_ms": {name: round(seconds * 1000, 1) for name, seconds in self.connect_seconds.items()},
+        }
+
+# startup profiler 싱글톤 패턴
+startup_profiler = StartupProfiler()
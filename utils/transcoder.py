@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import os
+from typing import Awaitable, Callable, List, Optional
+
+from config.settings import load_settings
+
+logger = logging.getLogger(__name__)
+load_settings()
+
+ProgressCallback = Callable[[float], Awaitable[None]]
+
+
+class TranscodeError(Exception):
+    pass
+
+
+def _optional_int(name: str) -> Optional[int]:
+    value = os.getenv(name)
+    return int(value) if value else None
+
+
+class Transcoder:
+    '''
+    ffmpeg 변환 stage
+    - 동시에 실행되는 ffmpeg 프로세스 수를 CPU core 수 이하로 제한
+    - 속도 위주 preset (-preset veryfast), 해상도/fps 상한 옵션
+    - ffmpeg -progress 출력을 파싱해서 진행률 callback 호출
+    - timeout 또는 cancel 시 ffmpeg 프로세스 kill
+    '''
+    _CPU_COUNT = os.cpu_count() or 1
+    _FFMPEG_WORKERS = min(int(os.getenv("FFMPEG_WORKERS", _CPU_COUNT)), _CPU_COUNT)
+    _FFMPEG_PRESET = os.getenv("FFMPEG_PRESET", "veryfast")
+    _FFMPEG_CRF = os.getenv("FFMPEG_CRF", "23")
+    _FFMPEG_MAX_HEIGHT = _optional_int("FFMPEG_MAX_HEIGHT")
+    _FFMPEG_MAX_FPS = _optional_int("FFMPEG_MAX_FPS")
+    _FFMPEG_TIMEOUT = int(os.getenv("FFMPEG_TIMEOUT", 300))
+    _FFPROBE_TIMEOUT = float(os.getenv("FFPROBE_TIMEOUT", 30))
+
+    def __init__(self):
+        self.semaphore = asyncio.Semaphore(self._FFMPEG_WORKERS)
+        # 동시 실행 프로세스들이 core를 나눠 쓰도록 프로세스 당 thread 수 제한
+        self.threads_per_process = max(1, self._CPU_COUNT // self._FFMPEG_WORKERS)
+        self.running = 0
+
+    def build_command(self, input_file: str, output_file: str) -> List[str]:
+        command = [
+            'ffmpeg', '-y', '-hide_banner', '-nostats', '-loglevel', 'error',
+            '-i', input_file,
+            '-c:v', 'libx264', '-preset', self._FFMPEG_PRESET, '-crf', self._FFMPEG_CRF,
+            '-threads', str(self.threads_per_process),
+            '-c:a', 'aac',
+            '-movflags', '+faststart',
+            '-progress', 'pipe:1',
+        ]
+
+        filters = []
+        if self._FFMPEG_MAX_HEIGHT:
+            # 원본이 더 작으면 그대로 유지, width는 비율 유지 (짝수)
+            filters.append(f"scale=-2:'min(ih,{self._FFMPEG_MAX_HEIGHT})'")
+        if self._FFMPEG_MAX_FPS:
+            filters.append(f"fps={self._FFMPEG_MAX_FPS}")
+        if filters:
+            command += ['-vf', ','.join(filters)]
+
+        command.append(output_file)
+        return command
+
+    async def probe_duration(self, input_file: str) -> Optional[float]:
+        process = await asyncio.create_subprocess_exec(
+            'ffprobe', '-v', 'error',
+            '-show_entries', 'format=duration',
+            '-of', 'default=noprint_wrappers=1:nokey=1',
+            input_file,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        try:
+            stdout, _ = await asyncio.wait_for(process.communicate(), self._FFPROBE_TIMEOUT)
+        except BaseException as e:
+            # timeout, cancel 모두 ffprobe 프로세스를 정리
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            if isinstance(e, asyncio.TimeoutError):
+                raise TranscodeError(f"ffprobe timed out after {self._FFPROBE_TIMEOUT} seconds") from e
+            raise
+        try:
+            return float(stdout.decode().strip())
+        except ValueError:
+            return None
+
+    @staticmethod
+    async def _read_progress(stream: asyncio.StreamReader,
+                             duration: Optional[float],
+                             progress_callback: Optional[ProgressCallback]):
+        # callback이 실패해도 pipe는 끝까지 읽음 (읽지 않으면 pipe가 가득 차서 ffmpeg가 멈춤)
+        async for raw_line in stream:
+            key, _, value = raw_line.decode(errors="ignore").strip().partition('=')
+            if progress_callback is None:
+                continue
+            try:
+                if key == 'out_time_us' and duration and value.isdigit():
+                    await progress_callback(min(int(value) / 1_000_000 / duration, 1.0))
+                elif key == 'progress' and value == 'end':
+                    await progress_callback(1.0)
+            except Exception as e:
+                logger.warning(f"ffmpeg 진행률 callback 실패: {e}")
+
+    async def _run(self,
+                   command: List[str],
+                   output_file: str,
+                   duration: Optional[float],
+                   progress_callback: Optional[ProgressCallback],
+                   timeout: float):
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        progress_task = asyncio.create_task(self._read_progress(process.stdout, duration, progress_callback))
+        stderr_task = asyncio.create_task(process.stderr.read())
+        try:
+            returncode = await asyncio.wait_for(process.wait(), timeout)
+            # 프로세스가 끝나면 pipe가 닫히므로 남은 출력까지 읽고 종료됨
+            await progress_task
+            stderr = await stderr_task
+        except BaseException as e:
+            # timeout, cancel 모두 reader task의 결과(exception)를 회수한 뒤 ffmpeg 프로세스를 정리
+            for task in (progress_task, stderr_task):
+                task.cancel()
+            await asyncio.gather(progress_task, stderr_task, return_exceptions=True)
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            if os.path.exists(output_file):
+                os.remove(output_file)
+            if isinstance(e, asyncio.TimeoutError):
+                raise TranscodeError(f"ffmpeg timed out after {timeout} seconds") from e
+            raise
+        return returncode, stderr
+
+    async def transcode(self,
+                        input_file: str,
+                        output_file: str,
+                        progress_callback: Optional[ProgressCallback] = None,
+                        timeout: Optional[float] = None) -> str:
+        timeout = timeout or self._FFMPEG_TIMEOUT
+
+        async with self.semaphore:
+            self.running += 1
+            try:
+                duration = await self.probe_duration(input_file)
+                returncode, stderr = await self._run(
+                    self.build_command(input_file, output_file),
+                    output_file, duration, progress_callback, timeout,
+                )
+            finally:
+                self.running -= 1
+
+        if returncode != 0:
+            raise TranscodeError(f"ffmpeg exited with {returncode}: {stderr.decode(errors='ignore').strip()}")
+
+        logger.info(f"ffmpeg 변환 완료 : {input_file} -> {output_file}")
+        return output_file
+
+    def stats(self) -> dict:
+        return {
+            "workers": self._FFMPEG_WORKERS,
+            "running": self.running,
+        }
+
+# ffmpeg transcoder 싱글톤 패턴
+transcoder = Transcoder()